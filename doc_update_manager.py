@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # file: scripts/doc_update_manager.py
-# version: 2.1.0
+# version: 2.24.0
 # guid: 9e8d7c6b-5a49-3827-1605-4f3e2d1c0b9a
 
 """
@@ -8,22 +8,68 @@ Enhanced Documentation Update Manager
 
 This script processes JSON-based documentation update files and applies them
 to target documentation files. It supports various update modes and provides
-comprehensive logging and error handling.
+comprehensive logging and error handling. Updates can also be queued in bulk
+as .ndjson files holding one update record per line.
 
 Usage:
     python doc_update_manager.py [options]
     python doc_update_manager.py --updates-dir .github/doc-updates
     python doc_update_manager.py --dry-run --verbose
+    python doc_update_manager.py --batch
+    python doc_update_manager.py --batch --jobs 8
+    python doc_update_manager.py --atomic
+    python doc_update_manager.py --journal --cleanup false
+    python doc_update_manager.py bench --targets 10 --doc-size 512 --batch
+    python doc_update_manager.py --metrics-file /tmp/doc_updates.json
+    python doc_update_manager.py --watch --debounce 2
+    python doc_update_manager.py --cache-size 256
+    python doc_update_manager.py --compact-after 7 --retain-days 90
+    python doc_update_manager.py --max-files 5000 --time-budget 300
+    python doc_update_manager.py --pipeline --jobs 4
+    python doc_update_manager.py --diff
+    python doc_update_manager.py --patch /tmp/doc-updates.patch
+    python doc_update_manager.py --mmap-threshold 16
+    python doc_update_manager.py --repos-file repos.txt --repo-workers 8 --max-writers 4
 """
 
 import argparse
+import asyncio
+import bisect
+import codecs
+import ctypes
+import ctypes.util
+import difflib
+import hashlib
+import heapq
 import json
 import logging
+import mmap
+import multiprocessing
+import os
 import re
+import select
 import shutil
+import stat
+import struct
 import sys
+import tarfile
+import tempfile
+import threading
+import time
+import traceback
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from itertools import accumulate
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Configure logging
 logging.basicConfig(
@@ -32,6 +78,1375 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class PendingUpdate:
+    """A parsed and validated update waiting to be applied to its target."""
+
+    update_file: Path
+    update_data: Dict[str, Any]
+    # SHA-256 of the update file name and raw bytes, used as its journal key
+    digest: str = ""
+    # perf_counter() when work on this update started, for latency reporting
+    started: float = 0.0
+    # 1-based line of the record in a bulk .ndjson queue file, 0 for .json files
+    line: int = 0
+    # Earlier updates whose effect this one overwrites; archived once it commits
+    superseded: List["PendingUpdate"] = field(default_factory=list)
+    # Repository root the target path is resolved against, if not the cwd
+    root: Optional[Path] = None
+
+    @property
+    def target_file(self) -> Path:
+        return _target_path(self.update_data, self.root)
+
+    @property
+    def name(self) -> str:
+        return _update_name(self.update_file, self.line)
+
+
+def _target_path(update_data: Dict[str, Any], root: Optional[Path] = None) -> Path:
+    """Resolve an update's target file, relative to a repository root if given.
+
+    The path is normalized so that spellings like `T.md`, `./T.md` and
+    `sub/../T.md` key the same chain, load and staged write.
+    """
+    target_file = Path(update_data["file"])
+    if root is not None:
+        target_file = root / target_file
+    return Path(os.path.normpath(target_file))
+
+
+def _escapes_root(file_value: str) -> bool:
+    """Whether a target path is absolute or leads out of the root it is resolved against."""
+    if Path(file_value).anchor:
+        return True
+    return Path(os.path.normpath(file_value)).parts[:1] == ("..",)
+
+
+def _update_name(update_file: Path, line: int = 0) -> str:
+    """Name an update in logs and stats, including its line in a bulk file."""
+    return f"{update_file.name}:{line}" if line else update_file.name
+
+
+def _parse_json(raw: bytes) -> Any:
+    """Parse a JSON document from UTF-8 bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw.decode("utf-8"))
+
+
+# Errors _parse_json raises for invalid input (orjson's error is a ValueError)
+JSON_ERRORS = (UnicodeDecodeError, ValueError)
+
+
+def _sniff_encoding(prefix: bytes) -> str:
+    """Guess a target's encoding from its first bytes: UTF-8, else latin-1."""
+    try:
+        # Not final, so a character cut off at the end of the prefix is fine
+        codecs.getincrementaldecoder("utf-8")().decode(prefix)
+    except UnicodeDecodeError:
+        return "latin-1"
+    return "utf-8"
+
+
+def _task_pattern(task_key: str) -> "re.Pattern[str]":
+    """Build the pattern matching open task lines that mention a key."""
+    # Anchored at the checkbox; the lookahead only scans the rest of one line
+    return re.compile(
+        rf"^([ \t]*)- \[ \] (?=[^\n]*?{re.escape(task_key)})", re.MULTILINE
+    )
+
+
+def _done_task_pattern(task_key: str) -> "re.Pattern[str]":
+    """Build the pattern matching completed task lines that mention a key."""
+    return re.compile(
+        rf"^[ \t]*- \[[xX]\] (?=[^\n]*?{re.escape(task_key)})", re.MULTILINE
+    )
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton reporting which of many keys occur in a text.
+
+    Built once for a set of keys, it finds all of them, overlapping or not,
+    in one left-to-right scan of each text it searches.
+    """
+
+    def __init__(self, keys: List[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        # An empty key occurs in every text
+        self._everywhere = {index for index, key in enumerate(keys) if not key}
+        for index, key in enumerate(keys):
+            state = 0
+            for char in key:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[state][char] = next_state
+                state = next_state
+            if key:
+                self._out[state] += (index,)
+
+        # Breadth-first, so each state's fallback is final before its children
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    def search(self, text: str, start: int = 0, end: Optional[int] = None) -> Set[int]:
+        """Return the indices of the keys occurring in text[start:end]."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set(self._everywhere)
+        state = 0
+        for char in text[start:end]:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return found
+
+
+# Builders for the patterns used by the update modes, keyed by pattern kind.
+# Static patterns take no key; the others are specialised per section/task.
+PATTERN_BUILDERS: Dict[str, Callable[..., "re.Pattern[str]"]] = {
+    # Heading lines (level, title) or task-list lines (checkbox state)
+    "index": lambda _: re.compile(
+        r"^(?:(#{1,6})(?:[ \t]+([^\n]*?))?[ \t]*$|[ \t]*- \[([ xX])\] )",
+        re.MULTILINE,
+    ),
+    "changelog-version": lambda _: re.compile(r"\[[\d.]+\]"),
+    "heading": lambda _: re.compile(r"^#{1,6}(?:[ \t]|$)", re.MULTILINE),
+    # Heading lines (level, title) in the raw bytes of a mapped target
+    "heading-bytes": lambda _: re.compile(
+        rb"^(#{1,6})(?:[ \t]+([^\n]*?))?[ \t]*$", re.MULTILINE
+    ),
+    "task-complete": _task_pattern,
+    "task-done": _done_task_pattern,
+}
+
+
+# Suffixes of queue files picked up from the updates directory
+UPDATE_SUFFIXES = (".json", ".ndjson")
+
+# Suffix of bulk queue files holding one update record per line
+BULK_SUFFIX = ".ndjson"
+
+# Queue files are discovered and processed in sorted chunks of this many names
+DISCOVERY_CHUNK_SIZE = 10000
+
+# Updates buffered between the parse, apply and commit stages of --pipeline
+PIPELINE_QUEUE_SIZE = 64
+
+# Modes that only ever add bytes at the end of the target
+APPEND_ONLY_MODES = ("append", "task-add")
+
+# Modes whose result is already present when they leave a document unchanged
+IDEMPOTENT_MODES = ("replace", "replace-section", "task-complete", "update-badge")
+
+# Modes that can edit a large target through a memory map by anchor search
+MAPPED_MODES = ("insert-after", "insert-before", "replace-section", "changelog-entry")
+
+# Bytes read from the start of a target to detect its encoding
+ENCODING_SNIFF_BYTES = 64 * 1024
+
+# Unchanged bytes are copied between splices in chunks of this size
+SPLICE_CHUNK_BYTES = 1024 * 1024
+
+# Edited documents are joined back into one piece past this many pieces
+DOCUMENT_MAX_PIECES = 4096
+
+
+@dataclass(frozen=True)
+class ModeSchema:
+    """Options an update mode requires (non-empty strings) or accepts (strings)."""
+
+    required: Tuple[str, ...] = ()
+    optional: Tuple[str, ...] = ()
+
+
+# Fields every update record needs; all of them must be strings
+RECORD_FIELDS = ("file", "mode", "content")
+
+# Declarative schema of every update mode, keyed by mode. Options not listed
+# here are ignored, so records written for newer versions still load.
+MODE_SCHEMAS: Dict[str, ModeSchema] = {
+    "append": ModeSchema(),
+    "prepend": ModeSchema(),
+    "replace": ModeSchema(),
+    "replace-section": ModeSchema(required=("section",)),
+    "insert-after": ModeSchema(required=("after",)),
+    "insert-before": ModeSchema(required=("before",)),
+    "changelog-entry": ModeSchema(),
+    "task-add": ModeSchema(),
+    "task-complete": ModeSchema(optional=("task_id",)),
+    "update-badge": ModeSchema(required=("badge_name",)),
+}
+
+
+def _compile_options_validator(
+    mode: str, schema: ModeSchema
+) -> Callable[[Dict[str, Any]], List[str]]:
+    """Build a function returning every problem with a mode's options."""
+    required = schema.required
+    optional = schema.optional
+
+    def validate(options: Dict[str, Any]) -> List[str]:
+        problems = []
+        for name in required:
+            value = options.get(name)
+            if not value:
+                problems.append(f"{mode} mode requires '{name}' option")
+            elif not isinstance(value, str):
+                problems.append(f"Option '{name}' must be a string")
+        for name in optional:
+            value = options.get(name)
+            if value is not None and not isinstance(value, str):
+                problems.append(f"Option '{name}' must be a string")
+        return problems
+
+    return validate
+
+
+# Option validators compiled once from MODE_SCHEMAS, keyed by mode
+OPTIONS_VALIDATORS: Dict[str, Callable[[Dict[str, Any]], List[str]]] = {
+    mode: _compile_options_validator(mode, schema) for mode, schema in MODE_SCHEMAS.items()
+}
+
+
+def validate_update_record(update_data: Any, confined: bool = False) -> List[str]:
+    """Return every problem with an update record; empty if it is valid.
+
+    Only the record itself is checked, so a bad update is rejected before
+    its target is read. With confined, the target must be a relative path
+    that stays inside the root it is resolved against.
+    """
+    if not isinstance(update_data, dict):
+        return ["Update must be a JSON object"]
+
+    problems = []
+    for field in RECORD_FIELDS:
+        if field not in update_data:
+            problems.append(f"Missing required field: {field}")
+        elif not isinstance(update_data[field], str):
+            problems.append(f"Field '{field}' must be a string")
+    file_value = update_data.get("file")
+    if file_value == "":
+        problems.append("Field 'file' must not be empty")
+    elif confined and isinstance(file_value, str) and _escapes_root(file_value):
+        problems.append("Field 'file' must be a relative path inside the repository")
+
+    options = update_data.get("options", {})
+    if not isinstance(options, dict):
+        problems.append("Field 'options' must be a JSON object")
+        options = {}
+    mode = update_data.get("mode")
+    if isinstance(mode, str):
+        validate_options = OPTIONS_VALIDATORS.get(mode)
+        if validate_options is None:
+            problems.append(f"Unknown update mode: {mode}")
+        else:
+            problems.extend(validate_options(options))
+    return problems
+
+
+# Outcomes of applying one update to its target
+UPDATE_APPLIED = "applied"
+UPDATE_UNCHANGED = "unchanged"
+UPDATE_FAILED = "failed"
+
+# The ## [Unreleased] heading as matched line-by-line on raw bytes
+UNRELEASED_HEADING = re.compile(rb"##[ \t]+\[Unreleased\]")
+
+
+class PatternCache:
+    """Size-bounded LRU cache of compiled patterns keyed on (kind, key)."""
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._patterns: "OrderedDict[Tuple[str, Optional[str]], re.Pattern[str]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, key: Optional[str] = None) -> "re.Pattern[str]":
+        """Return the compiled pattern for kind/key, building it on a miss."""
+        cache_key = (kind, key)
+        with self._lock:
+            pattern = self._patterns.get(cache_key)
+            if pattern is not None:
+                self.hits += 1
+                self._patterns.move_to_end(cache_key)
+                return pattern
+            self.misses += 1
+
+        pattern = PATTERN_BUILDERS[kind](key)
+        with self._lock:
+            self._patterns[cache_key] = pattern
+            while len(self._patterns) > self.maxsize:
+                self._patterns.popitem(last=False)
+        return pattern
+
+
+class StageTimer:
+    """Thread-safe call count, total and maximum wall time per pipeline stage."""
+
+    def __init__(self):
+        self._stages: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block and add it to the stage's aggregates."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started)
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add one measured call to a stage."""
+        with self._lock:
+            aggregate = self._stages.setdefault(stage, [0, 0.0, 0.0])
+            aggregate[0] += 1
+            aggregate[1] += seconds
+            aggregate[2] = max(aggregate[2], seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Return the aggregates as {stage: {count, total_s, max_s}}."""
+        with self._lock:
+            return {
+                stage: {"count": count, "total_s": total, "max_s": longest}
+                for stage, (count, total, longest) in sorted(self._stages.items())
+            }
+
+
+@dataclass
+class StagedTarget:
+    """A folded target document waiting for the atomic commit phase."""
+
+    target_file: Path
+    # None when every update was already satisfied and nothing needs writing
+    content: Optional[str]
+    applied: List[PendingUpdate]
+    unchanged: List[PendingUpdate]
+    document: Optional["MarkdownDocument"] = None
+    temp_file: Optional[Path] = None
+
+    @property
+    def updates(self) -> List[PendingUpdate]:
+        return self.applied + self.unchanged
+
+
+@dataclass
+class FoldedUpdate:
+    """An update folded by the pipeline's apply stage, on its way to commit."""
+
+    pending: PendingUpdate
+    outcome: str
+    # Position of the update in fold order, across all targets
+    sequence: int = 0
+    # Document revision after the update
+    revision: int = 0
+    # Document spans after an applied update; only a group's last one is kept
+    snapshot: Optional[Tuple[Tuple[str, int, int], ...]] = None
+    # Text an append-only update added at the end of the document
+    appended: Optional[str] = None
+
+
+class BulkQueue:
+    """The records of one bulk .ndjson queue file and which have left it.
+
+    A record leaves the queue when it is archived as processed, failed or
+    malformed. Once every record has left, the file itself is archived to
+    processed/ without the records that were split out to failed/ or
+    malformed/; otherwise it is rewritten with the records that left
+    blanked out, so the records still queued keep their line numbers and
+    journal keys.
+    """
+
+    def __init__(self, path: Path, lines: List[bytes]):
+        self.path = path
+        self.lines = lines
+        self._removed: Set[int] = set()
+        # Records archived on their own to failed/ or malformed/
+        self._split: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def record(self, line: int) -> bytes:
+        """Return the raw bytes of a 1-based line."""
+        return self.lines[line - 1]
+
+    def remove(self, line: int, split: bool = False) -> None:
+        """Mark a record as no longer queued, split out to its own file if split."""
+        with self._lock:
+            self._removed.add(line)
+            if split:
+                self._split.add(line)
+
+    @property
+    def touched(self) -> bool:
+        return bool(self._removed)
+
+    def remaining(self) -> List[bytes]:
+        """Return the records that are still queued, in order."""
+        with self._lock:
+            return [
+                raw
+                for line, raw in enumerate(self.lines, 1)
+                if line not in self._removed
+            ]
+
+    def queued_lines(self) -> List[bytes]:
+        """Return the file's lines with records that left the queue blanked."""
+        with self._lock:
+            return self._blanked(self._removed)
+
+    def processed_lines(self) -> List[bytes]:
+        """Return the file's lines with records split out to their own files blanked."""
+        with self._lock:
+            return self._blanked(self._split)
+
+    @property
+    def split(self) -> bool:
+        return bool(self._split)
+
+    def _blanked(self, lines_out: Set[int]) -> List[bytes]:
+        lines = [
+            b"" if line in lines_out else raw
+            for line, raw in enumerate(self.lines, 1)
+        ]
+        while lines and not lines[-1]:
+            # Nothing follows, so no line number changes
+            lines.pop()
+        return lines
+
+
+class UpdateArchive:
+    """Date-sharded archive for processed, malformed and failed updates.
+
+    Archived files go to <category>/YYYY/MM/DD/HHMMSS_<name>, so no single
+    directory grows without bound. Day shards older than a cutoff can be
+    compacted into one <category>/YYYY/MM/YYYY-MM-DD.tar.gz segment and
+    pruned after a retention period. Error details for each run go to one
+    append-only errors/<run>.jsonl log instead of a sidecar per file.
+    """
+
+    def __init__(self, updates_dir: Path):
+        self.errors_dir = updates_dir / "errors"
+        self.error_log: Optional[Path] = None
+        # Archive paths handed out this run, so same-second names never collide
+        self._reserved: Set[Path] = set()
+        self._lock = threading.Lock()
+        self.start_run()
+
+    def start_run(self) -> None:
+        """Begin a new run with its own error log."""
+        now = datetime.now()
+        with self._lock:
+            self._reserved.clear()
+            self.error_log = self.errors_dir / f"{now:%Y%m%d_%H%M%S}_{os.getpid()}.jsonl"
+
+    def path_for(self, category_dir: Path, name: str, now: datetime) -> Path:
+        """Reserve a unique archive path for name in today's shard."""
+        shard = category_dir / f"{now:%Y}" / f"{now:%m}" / f"{now:%d}"
+        shard.mkdir(parents=True, exist_ok=True)
+        prefix = f"{now:%H%M%S}"
+        with self._lock:
+            path = shard / f"{prefix}_{name}"
+            sequence = 1
+            while path in self._reserved or path.exists():
+                path = shard / f"{prefix}_{sequence}_{name}"
+                sequence += 1
+            self._reserved.add(path)
+        return path
+
+    def log_error(self, entry: Dict[str, Any]) -> None:
+        """Append an error record to this run's error log."""
+        line = json.dumps(entry, sort_keys=True) + "\n"
+        with self._lock:
+            self.errors_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.error_log, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    @staticmethod
+    def _day_shards(category_dir: Path) -> Iterator[Tuple[date, Path]]:
+        """Yield (day, directory) for each YYYY/MM/DD shard."""
+        for year_dir in category_dir.iterdir():
+            if not (year_dir.is_dir() and year_dir.name.isdigit()):
+                continue
+            for month_dir in year_dir.iterdir():
+                if not (month_dir.is_dir() and month_dir.name.isdigit()):
+                    continue
+                for day_dir in month_dir.iterdir():
+                    if not (day_dir.is_dir() and day_dir.name.isdigit()):
+                        continue
+                    try:
+                        day = date(int(year_dir.name), int(month_dir.name), int(day_dir.name))
+                    except ValueError:
+                        continue
+                    yield day, day_dir
+
+    @staticmethod
+    def _segments(category_dir: Path) -> Iterator[Tuple[date, Path]]:
+        """Yield (day, file) for each compacted YYYY-MM-DD*.tar.gz segment."""
+        for segment in category_dir.glob("*/*/*.tar.gz"):
+            try:
+                day = datetime.strptime(segment.name[:10], "%Y-%m-%d").date()
+            except ValueError:
+                continue
+            yield day, segment
+
+    def shard_flat_files(self, category_dir: Path) -> int:
+        """Move files from the old flat YYYYMMDD_HHMMSS_<name> layout into shards."""
+        moved = 0
+        with os.scandir(category_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+                try:
+                    archived_at = datetime.strptime(entry.name[:15], "%Y%m%d_%H%M%S")
+                except ValueError:
+                    continue
+                path = self.path_for(category_dir, entry.name[16:], archived_at)
+                os.replace(entry.path, path)
+                moved += 1
+        return moved
+
+    def compact(self, category_dir: Path, before: date) -> int:
+        """Pack each day shard older than before into a tar.gz segment."""
+        compacted = 0
+        for day, day_dir in sorted(self._day_shards(category_dir)):
+            if day >= before:
+                continue
+            segment = day_dir.parent / f"{day.isoformat()}.tar.gz"
+            sequence = 1
+            while segment.exists():
+                # A late file for an already compacted day gets its own segment
+                segment = day_dir.parent / f"{day.isoformat()}.{sequence}.tar.gz"
+                sequence += 1
+            temp_file = segment.with_name(f".{segment.name}.tmp")
+            with tarfile.open(temp_file, "w:gz") as tar:
+                for path in sorted(day_dir.iterdir()):
+                    tar.add(path, arcname=path.name)
+            os.replace(temp_file, segment)
+            shutil.rmtree(day_dir)
+            compacted += 1
+        return compacted
+
+    def prune(self, category_dir: Path, before: date) -> int:
+        """Delete day shards and segments older than before."""
+        pruned = 0
+        for day, day_dir in list(self._day_shards(category_dir)):
+            if day < before:
+                shutil.rmtree(day_dir)
+                pruned += 1
+        for day, segment in list(self._segments(category_dir)):
+            if day < before:
+                segment.unlink()
+                pruned += 1
+        # Drop month and year directories left empty
+        for month_dir in sorted(category_dir.glob("*/*"), reverse=True):
+            if month_dir.is_dir() and not any(month_dir.iterdir()):
+                month_dir.rmdir()
+        for year_dir in category_dir.iterdir():
+            if year_dir.is_dir() and year_dir.name.isdigit() and not any(year_dir.iterdir()):
+                year_dir.rmdir()
+        return pruned
+
+    def prune_error_logs(self, before: date) -> int:
+        """Delete run error logs older than before."""
+        if not self.errors_dir.exists():
+            return 0
+        pruned = 0
+        for log_file in self.errors_dir.glob("*.jsonl"):
+            try:
+                day = datetime.strptime(log_file.name[:8], "%Y%m%d").date()
+            except ValueError:
+                continue
+            if day < before and log_file != self.error_log:
+                log_file.unlink()
+                pruned += 1
+        return pruned
+
+
+class UpdateJournal:
+    """Append-only JSONL record of applied updates, keyed by content hash.
+
+    Each line records the SHA-256 of an update file (name and bytes) and the
+    digest of the target it produced. Only the update digests are held in memory, so
+    checking whether an update was already applied is a set lookup. Entries
+    are only needed while their update is queued; prune() drops the rest.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._applied = set()
+        self._lock = threading.Lock()
+        if path.exists():
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._applied.add(json.loads(line)["update"])
+                    except (ValueError, KeyError, TypeError):
+                        # Torn trailing line from an interrupted run
+                        continue
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._applied
+
+    def record(self, entries: List[Dict[str, Any]]) -> None:
+        """Append entries for applied updates and flush them to disk."""
+        lines = "".join(json.dumps(entry, sort_keys=True) + "\n" for entry in entries)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+            self._applied.update(entry["update"] for entry in entries)
+
+    def prune(self, keep: Callable[[Dict[str, Any]], bool]) -> int:
+        """Rewrite the journal without the entries keep() rejects.
+
+        Torn lines are dropped as well. The journal is only rewritten if
+        something was dropped. Returns the number of lines dropped.
+        """
+        with self._lock:
+            if not self.path.exists():
+                return 0
+            kept: List[Dict[str, Any]] = []
+            dropped = 0
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        entry = None
+                    if not isinstance(entry, dict) or "update" not in entry:
+                        # Torn trailing line from an interrupted run
+                        dropped += 1
+                        continue
+                    if keep(entry):
+                        kept.append(entry)
+                    else:
+                        dropped += 1
+            if not dropped:
+                return 0
+            temp_file = self.path.with_name(f".{self.path.name}.tmp")
+            with open(temp_file, "w", encoding="utf-8") as f:
+                f.write("".join(json.dumps(entry, sort_keys=True) + "\n" for entry in kept))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.path)
+            self._applied = {entry["update"] for entry in kept}
+            return dropped
+
+
+class TargetDigests:
+    """Running SHA-256 digests of targets as they were last written.
+
+    Journal entries record the digest of the target an update produced.
+    Writes hash the bytes they write and appends extend the digest of the
+    bytes before them, so a target is only read back when it was not written
+    here. A digest is used only while the file's (mtime_ns, size) match the
+    write that produced it. When disabled, nothing is hashed or tracked.
+    """
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._entries: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stat(path: Path) -> Tuple[int, int]:
+        info = path.stat()
+        return info.st_mtime_ns, info.st_size
+
+    def hasher(self) -> Optional[Any]:
+        """Return a new hasher for a streamed write, or None when disabled."""
+        return hashlib.sha256() if self.enabled else None
+
+    def wrote(self, path: Path, digest: Optional[Any]) -> None:
+        """Record the digest of the whole content just written to path."""
+        if digest is None:
+            return
+        file_stat = self._stat(path)
+        with self._lock:
+            self._entries[path] = (file_stat, digest)
+
+    def wrote_text(self, path: Path, text: str) -> None:
+        """Record the digest of text just written to path as UTF-8."""
+        if self.enabled:
+            self.wrote(path, hashlib.sha256(text.encode("utf-8")))
+
+    def appended(self, path: Path, file_stat: Tuple[int, int], data: bytes) -> None:
+        """Extend the digest of path, as it was at file_stat, by appended bytes."""
+        if not self.enabled:
+            return
+        with self._lock:
+            entry = self._entries.pop(path, None)
+        if entry is not None and entry[0] == file_stat:
+            entry[1].update(data)
+            self.wrote(path, entry[1])
+
+    def hexdigest(self, path: Path) -> str:
+        """Return the SHA-256 of path, reading it only if its digest is not known."""
+        file_stat = self._stat(path)
+        with self._lock:
+            entry = self._entries.get(path)
+        if entry is not None and entry[0] == file_stat:
+            return entry[1].hexdigest()
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        with self._lock:
+            self._entries[path] = (file_stat, digest)
+        return digest.hexdigest()
+
+
+class MarkdownDocument:
+    """In-memory target document with an incrementally maintained index.
+
+    The text is held as a piece table: (source, start, end) spans over the
+    original text and the inserted strings. Edits only rearrange spans, so
+    their cost follows the size of the edit; the full text is joined once
+    when it is read, typically when the document is written.
+
+    The index records the offset of every heading and task-list line and is
+    built by a single scan the first time it is needed. All edits go through
+    splice(), which rescans only the lines an edit touches and shifts the
+    offsets that follow it, so repeated section lookups never rescan the text.
+    """
+
+    def __init__(self, text: str, patterns: PatternCache):
+        self._pieces: List[Tuple[str, int, int]] = []
+        # Length of each piece and the document offset at which it starts
+        self._piece_lengths: List[int] = []
+        self._piece_offsets: List[int] = []
+        self._length = 0
+        self._set_text(text)
+        # Encoding the text was decoded from; targets are always written as UTF-8
+        self.encoding = "utf-8"
+        # Bumped whenever an edit actually changes the text
+        self.revision = 0
+        self._patterns = patterns
+        self._indexed = False
+        self._heading_offsets: List[int] = []
+        self._headings: List[Tuple[int, str]] = []
+        self._task_offsets: List[int] = []
+        self._tasks_done: List[bool] = []
+        # Lazily built lookups; invalidated when headings are added or removed
+        self._sections: Optional[Dict[str, int]] = None
+        self._changelog_marks: Optional[Tuple[Optional[int], Optional[int]]] = None
+        # Digests of updates known to be no-ops at the current revision
+        self._settled: Set[str] = set()
+        self._settled_revision = 0
+
+    @property
+    def text(self) -> str:
+        """The full text, joined from its pieces on the first read after edits."""
+        pieces = self._pieces
+        text = self.join(pieces)
+        if pieces and text is not pieces[0][0]:
+            self._set_text(text)
+        return text
+
+    def snapshot(self) -> Tuple[Tuple[str, int, int], ...]:
+        """Return the current pieces, to be joined later with join().
+
+        Sources are never modified and edits only replace pieces, so a
+        snapshot stays valid, even on another thread, while editing goes on.
+        """
+        return tuple(self._pieces)
+
+    @staticmethod
+    def join(pieces: Sequence[Tuple[str, int, int]]) -> str:
+        """Return the text the given pieces spell out."""
+        if not pieces:
+            return ""
+        source, start, end = pieces[0]
+        if len(pieces) == 1 and start == 0 and end == len(source):
+            return source
+        return "".join(source[start:end] for source, start, end in pieces)
+
+    def _set_text(self, text: str) -> None:
+        self._pieces = [(text, 0, len(text))] if text else []
+        self._piece_lengths = [len(text)] if text else []
+        self._piece_offsets = [0] if text else []
+        self._length = len(text)
+
+    def __len__(self) -> int:
+        return self._length
+
+    def memory_estimate(self) -> int:
+        """Approximate bytes held by the text and its index."""
+        sources = {id(source): source for source, _, _ in self._pieces}
+        index_entries = len(self._heading_offsets) + len(self._task_offsets)
+        # Roughly one int, one tuple/bool and list slots per index entry or piece
+        return (
+            sum(sys.getsizeof(source) for source in sources.values())
+            + 96 * (index_entries + len(self._pieces))
+        )
+
+    def _spans(self, start: int, end: int) -> Iterator[Tuple[int, str, int, int]]:
+        """Yield (offset, source, from, to) for the spans covering [start, end)."""
+        if start >= end:
+            return
+        pieces, offsets = self._pieces, self._piece_offsets
+        index = bisect.bisect_right(offsets, start) - 1
+        while index < len(pieces) and offsets[index] < end:
+            offset = offsets[index]
+            source, piece_start, piece_end = pieces[index]
+            span_start = piece_start + max(0, start - offset)
+            span_end = min(piece_end, piece_start + end - offset)
+            yield max(start, offset), source, span_start, span_end
+            index += 1
+
+    def slice(self, start: int, end: int) -> str:
+        """Return text[start:end] without joining the rest of the document."""
+        parts = [source[lo:hi] for _, source, lo, hi in self._spans(start, end)]
+        return parts[0] if len(parts) == 1 else "".join(parts)
+
+    def find_newline(self, start: int) -> int:
+        """Return the offset of the first newline at or after start, or -1."""
+        for offset, source, lo, hi in self._spans(start, self._length):
+            found = source.find("\n", lo, hi)
+            if found != -1:
+                return offset + found - lo
+        return -1
+
+    def rfind_newline(self, end: int) -> int:
+        """Return the offset of the last newline before end, or -1."""
+        index = bisect.bisect_left(self._piece_offsets, end) - 1
+        while index >= 0:
+            offset = self._piece_offsets[index]
+            source, lo, hi = self._pieces[index]
+            found = source.rfind("\n", lo, min(hi, lo + end - offset))
+            if found != -1:
+                return offset + found - lo
+            index -= 1
+        return -1
+
+    def line_at(self, start: int) -> str:
+        """Return the text from start to the end of its line."""
+        end = self.find_newline(start)
+        return self.slice(start, end if end != -1 else self._length)
+
+    def _ensure_index(self) -> None:
+        if not self._indexed:
+            self._scan(0, self._length, 0)
+            self._indexed = True
+
+    def _scan(self, start: int, end: int, shift: int) -> None:
+        """Append index entries for text[start:end], offset by shift."""
+        # Entries are appended in order, so callers scan regions left to right
+        shift += start
+        for match in self._patterns.get("index").finditer(self.slice(start, end)):
+            if match.group(1):
+                self._heading_offsets.append(match.start() + shift)
+                self._headings.append((len(match.group(1)), match.group(2) or ""))
+            else:
+                self._task_offsets.append(match.start() + shift)
+                self._tasks_done.append(match.group(3) != " ")
+
+    def splice(self, start: int, end: int, new_text: str) -> bool:
+        """Replace text[start:end] with new_text; see splice_many."""
+        return self.splice_many([(start, end, new_text)])
+
+    def splice_many(self, edits: List[Tuple[int, int, str]]) -> bool:
+        """Apply sorted, non-overlapping (start, end, text) edits.
+
+        Only the piece table is rebuilt; no text outside the edits is copied.
+        Returns True if the document text changed.
+        """
+        edits = [
+            edit
+            for edit in edits
+            if edit[1] - edit[0] != len(edit[2]) or self.slice(edit[0], edit[1]) != edit[2]
+        ]
+        if not edits:
+            return False
+
+        # Line bounds of the edits are taken from the text before the edits
+        regions = self._touched_lines(edits) if self._indexed else None
+        # Right to left, so the offsets of the pieces before each edit still hold
+        limit = len(self._pieces)
+        for start, end, new_text in reversed(edits):
+            count = len(self._pieces)
+            first = self._split(start, limit)
+            limit += len(self._pieces) - count
+            last = self._split(end, limit)
+            inserted = [(new_text, 0, len(new_text))] if new_text else []
+            self._pieces[first:last] = inserted
+            self._piece_lengths[first:last] = [len(new_text)] * len(inserted)
+            self._piece_offsets[first:last] = [start] * len(inserted)
+            self._length += len(new_text) - (end - start)
+            limit = first
+        self._piece_offsets = (
+            list(accumulate(self._piece_lengths[:-1], initial=0)) if self._pieces else []
+        )
+        if len(self._pieces) > DOCUMENT_MAX_PIECES:
+            # Keep span lookups cheap on very long edit chains
+            self._set_text(self.text)
+        self.revision += 1
+
+        if regions is not None:
+            self._reindex(regions)
+        return True
+
+    def _split(self, offset: int, limit: int) -> int:
+        """Start a piece at offset and return its index.
+
+        Only the first limit pieces are looked at; their offsets must be
+        current.
+        """
+        index = bisect.bisect_right(self._piece_offsets, offset, 0, limit) - 1
+        if index < 0:
+            return 0
+        piece_offset = self._piece_offsets[index]
+        if offset == piece_offset:
+            return index
+        source, lo, hi = self._pieces[index]
+        cut = lo + offset - piece_offset
+        if cut >= hi:
+            return index + 1
+        self._pieces[index : index + 1] = [(source, lo, cut), (source, cut, hi)]
+        self._piece_lengths[index : index + 1] = [cut - lo, hi - cut]
+        self._piece_offsets.insert(index + 1, offset)
+        return index + 1
+
+    def _touched_lines(self, edits: List[Tuple[int, int, str]]) -> List[List[int]]:
+        """Widen each edit to whole lines and merge overlaps.
+
+        Returns [line_start, line_end, length delta] regions in the text
+        before the edits.
+        """
+        regions: List[List[int]] = []
+        for start, end, new_text in edits:
+            line_start = self.rfind_newline(start) + 1
+            line_end = self.find_newline(end)
+            if line_end == -1:
+                line_end = self._length
+            delta = len(new_text) - (end - start)
+            if regions and line_start <= regions[-1][1]:
+                regions[-1][1] = max(regions[-1][1], line_end)
+                regions[-1][2] += delta
+            else:
+                regions.append([line_start, line_end, delta])
+        return regions
+
+    def _reindex(self, regions: List[List[int]]) -> None:
+        """Update the index after edits, rescanning only the touched lines."""
+        heading_offsets, headings = self._heading_offsets, self._headings
+        task_offsets, tasks_done = self._task_offsets, self._tasks_done
+        self._heading_offsets, self._headings = [], []
+        self._task_offsets, self._tasks_done = [], []
+        headings_changed = False
+        shift = 0
+        heading_pos = task_pos = 0
+        for line_start, line_end, delta in regions:
+            # Keep entries before the region, shifted by earlier edits
+            first = bisect.bisect_left(heading_offsets, line_start, heading_pos)
+            self._heading_offsets.extend(o + shift for o in heading_offsets[heading_pos:first])
+            self._headings.extend(headings[heading_pos:first])
+            heading_pos = bisect.bisect_right(heading_offsets, line_end, first)
+            headings_changed = headings_changed or heading_pos != first
+
+            first = bisect.bisect_left(task_offsets, line_start, task_pos)
+            self._task_offsets.extend(o + shift for o in task_offsets[task_pos:first])
+            self._tasks_done.extend(tasks_done[task_pos:first])
+            task_pos = bisect.bisect_right(task_offsets, line_end, first)
+
+            # Rescan the region as it reads after the edits
+            heading_count = len(self._headings)
+            self._scan(line_start + shift, line_end + shift + delta, 0)
+            headings_changed = headings_changed or len(self._headings) != heading_count
+            shift += delta
+
+        self._heading_offsets.extend(o + shift for o in heading_offsets[heading_pos:])
+        self._headings.extend(headings[heading_pos:])
+        self._task_offsets.extend(o + shift for o in task_offsets[task_pos:])
+        self._tasks_done.extend(tasks_done[task_pos:])
+
+        if headings_changed:
+            self._sections = None
+            self._changelog_marks = None
+
+    def find_section(self, title: str) -> Optional[Tuple[int, int, int]]:
+        """Return (start, end, level) of the first section with this title.
+
+        A section runs from its heading to the next heading of any level.
+        """
+        self._ensure_index()
+        if self._sections is None:
+            self._sections = {}
+            for position, (_, heading_title) in enumerate(self._headings):
+                self._sections.setdefault(heading_title, position)
+        position = self._sections.get(title)
+        if position is None:
+            return None
+        start = self._heading_offsets[position]
+        if position + 1 < len(self._heading_offsets):
+            end = self._heading_offsets[position + 1]
+        else:
+            end = self._length
+        return start, end, self._headings[position][0]
+
+    def changelog_offsets(self) -> Tuple[Optional[int], Optional[int]]:
+        """Return (end of the ## [Unreleased] line, start of first ## [x.y.z])."""
+        self._ensure_index()
+        if self._changelog_marks is None:
+            unreleased = version = None
+            version_pattern = self._patterns.get("changelog-version")
+            for position, (level, title) in enumerate(self._headings):
+                if level != 2:
+                    continue
+                if unreleased is None and title.startswith("[Unreleased]"):
+                    unreleased = position
+                if version is None and version_pattern.match(title):
+                    version = position
+            self._changelog_marks = (unreleased, version)
+
+        unreleased, version = self._changelog_marks
+        unreleased_end = version_start = None
+        if unreleased is not None:
+            line_end = self.find_newline(self._heading_offsets[unreleased])
+            # A heading on the last line without a newline does not count
+            if line_end != -1:
+                unreleased_end = line_end + 1
+        if version is not None:
+            version_start = self._heading_offsets[version]
+        return unreleased_end, version_start
+
+    def open_task_offsets(self) -> List[int]:
+        """Return the offsets of all unchecked task-list lines."""
+        return self._task_offsets_where(False)
+
+    def done_task_offsets(self) -> List[int]:
+        """Return the offsets of all checked task-list lines."""
+        return self._task_offsets_where(True)
+
+    def _task_offsets_where(self, done: bool) -> List[int]:
+        self._ensure_index()
+        return [
+            offset
+            for offset, task_done in zip(self._task_offsets, self._tasks_done)
+            if task_done == done
+        ]
+
+    def is_settled(self, update_digest: str) -> bool:
+        """Whether an update is known to leave this revision unchanged."""
+        return self._settled_revision == self.revision and update_digest in self._settled
+
+    def settle(self, update_digest: str) -> None:
+        """Remember that an update is a no-op at the current revision."""
+        if self._settled_revision != self.revision:
+            self._settled = set()
+            self._settled_revision = self.revision
+        self._settled.add(update_digest)
+
+
+@dataclass
+class CachedDocument:
+    """A parsed target held in the document cache."""
+
+    document: MarkdownDocument
+    encoding: str
+    # (st_mtime_ns, st_size) of the file the document was read from or written to
+    file_stat: Tuple[int, int]
+
+    @property
+    def weight(self) -> int:
+        """Approximate memory held by the entry, in bytes."""
+        return self.document.memory_estimate()
+
+
+class DocumentCache:
+    """LRU cache of parsed target documents bounded by approximate memory.
+
+    Entries are only served while the file's (mtime_ns, size) still match.
+    Callers take an entry out while editing its document and put it back
+    after writing, so an entry never describes bytes that are not on disk.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Path, CachedDocument]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def take(self, path: Path, file_stat: Tuple[int, int]) -> Optional[CachedDocument]:
+        """Remove and return the entry for path if it matches file_stat."""
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is None:
+                return None
+            self._bytes -= entry.weight
+        return entry if entry.file_stat == file_stat else None
+
+    def peek_encoding(self, path: Path, file_stat: Tuple[int, int]) -> Optional[str]:
+        """Return the detected encoding of a current entry without taking it."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry.file_stat != file_stat:
+                return None
+            return entry.encoding
+
+    def put(self, path: Path, entry: CachedDocument) -> None:
+        """Store an entry, evicting least recently used ones over the limit."""
+        weight = entry.weight
+        if weight > self.max_bytes:
+            self.discard(path)
+            return
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous is not None:
+                self._bytes -= previous.weight
+            self._entries[path] = entry
+            self._bytes += weight
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.weight
+
+    def discard(self, path: Path) -> None:
+        """Drop any entry for path."""
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self._bytes -= entry.weight
+
+
+class MappedTarget:
+    """A large target read through mmap and edited as byte-range splices.
+
+    Anchors are searched in the mapped bytes, so the document is never held
+    in memory whole; only titles and replaced ranges are decoded. Offsets
+    are byte offsets into the file.
+    """
+
+    def __init__(self, path: Path, patterns: PatternCache):
+        self.path = path
+        self._patterns = patterns
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.encoding = _sniff_encoding(self._map[:ENCODING_SNIFF_BYTES])
+
+    def __enter__(self) -> "MappedTarget":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._map.close()
+
+    def __len__(self) -> int:
+        return len(self._map)
+
+    def has_carriage_returns(self) -> bool:
+        """Whether line endings would need normalizing, as a text read does."""
+        return self._map.find(b"\r") != -1
+
+    def encode(self, text: str) -> Optional[bytes]:
+        """Return text as it is stored in the file, or None if it cannot be."""
+        try:
+            return text.encode(self.encoding)
+        except UnicodeEncodeError:
+            return None
+
+    def decode(self, start: int, end: int) -> str:
+        """Decode the bytes in [start, end)."""
+        return self._map[start:end].decode(self.encoding)
+
+    def find_all(self, needle: str) -> List[int]:
+        """Return the offsets of all non-overlapping occurrences of needle."""
+        data = self.encode(needle)
+        if data is None:
+            return []
+        offsets = []
+        position = self._map.find(data)
+        while position != -1:
+            offsets.append(position)
+            position = self._map.find(data, position + len(data))
+        return offsets
+
+    def _headings(self) -> Iterator[Tuple[int, int, str]]:
+        """Yield (offset, level, title) of each heading line in order."""
+        for match in self._patterns.get("heading-bytes").finditer(self._map):
+            title = match.group(2) or b""
+            yield match.start(), len(match.group(1)), title.decode(self.encoding)
+
+    def find_section(self, title: str) -> Optional[Tuple[int, int, int]]:
+        """Return (start, end, level) of the first section with this title.
+
+        A section runs from its heading to the next heading of any level.
+        """
+        found = None
+        for offset, level, heading_title in self._headings():
+            if found is not None:
+                return found[0], offset, found[1]
+            if heading_title == title:
+                found = (offset, level)
+        if found is None:
+            return None
+        return found[0], len(self._map), found[1]
+
+    def changelog_offsets(self) -> Tuple[Optional[int], Optional[int]]:
+        """Return (end of the ## [Unreleased] line, start of first ## [x.y.z])."""
+        version_pattern = self._patterns.get("changelog-version")
+        unreleased = version = None
+        for offset, level, title in self._headings():
+            if level != 2:
+                continue
+            if unreleased is None and title.startswith("[Unreleased]"):
+                unreleased = offset
+            if version is None and version_pattern.match(title):
+                version = offset
+            if unreleased is not None and version is not None:
+                break
+
+        unreleased_end = None
+        if unreleased is not None:
+            line_end = self._map.find(b"\n", unreleased)
+            # A heading on the last line without a newline does not count
+            if line_end != -1:
+                unreleased_end = line_end + 1
+        return unreleased_end, version
+
+    def write_spliced(
+        self, out: BinaryIO, edits: List[Tuple[int, int, str]], digest: Optional[Any] = None
+    ) -> int:
+        """Write the file with sorted (start, end, text) edits applied to out.
+
+        The output is UTF-8. Unchanged bytes are copied from the map in
+        bounded chunks, so memory stays near the size of the edits; they are
+        also fed to digest, if given. Raises UnicodeDecodeError if a target
+        sniffed as UTF-8 is not. Returns the number of bytes written.
+        """
+        validator = codecs.getincrementaldecoder("utf-8")()
+        size = len(self._map)
+        written = 0
+        position = 0
+        for start, end, text in edits + [(size, size, "")]:
+            while position < start:
+                chunk = self._map[position : min(start, position + SPLICE_CHUNK_BYTES)]
+                position += len(chunk)
+                if self.encoding == "utf-8":
+                    validator.decode(chunk)
+                else:
+                    chunk = chunk.decode(self.encoding).encode("utf-8")
+                out.write(chunk)
+                if digest is not None:
+                    digest.update(chunk)
+                written += len(chunk)
+            if self.encoding == "utf-8":
+                # Edits sit on character boundaries, so nothing may be pending
+                validator.decode(b"", final=True)
+            data = text.encode("utf-8")
+            out.write(data)
+            if digest is not None:
+                digest.update(data)
+            written += len(data)
+            position = end
+        return written
+
+
+class UpdateWatcher:
+    """Waits for new update files, using inotify where available.
+
+    On Linux the directory is watched through inotify (via ctypes, so no
+    extra dependency); elsewhere, or if inotify cannot be set up, the
+    directory listing is polled.
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    _EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, directory: Path, poll_interval: float = 1.0):
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        try:
+            self._fd = self._init_inotify()
+            logger.debug(f"👀 Watching {directory} with inotify")
+        except (OSError, AttributeError) as e:
+            logger.debug(f"👀 inotify unavailable ({e}); polling {directory}")
+            self._snapshot = self._scan()
+
+    def _init_inotify(self) -> int:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO
+        if libc.inotify_add_watch(fd, os.fsencode(self.directory), mask) < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, "inotify_add_watch failed")
+        return fd
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(UPDATE_SUFFIXES) and entry.is_file():
+                    info = entry.stat()
+                    snapshot[entry.name] = (info.st_mtime_ns, info.st_size)
+        return snapshot
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to timeout seconds; return True if update files arrived."""
+        if self._fd is None:
+            deadline = time.monotonic() + timeout
+            while True:
+                snapshot = self._scan()
+                changed = any(
+                    self._snapshot.get(name) != info for name, info in snapshot.items()
+                )
+                self._snapshot = snapshot
+                remaining = deadline - time.monotonic()
+                if changed or remaining <= 0:
+                    return changed
+                time.sleep(min(self.poll_interval, remaining))
+
+        readable, _, _ = select.select([self._fd], [], [], max(0.0, timeout))
+        if not readable:
+            return False
+        arrived = False
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                _, _, _, length = self._EVENT_HEADER.unpack_from(data, offset)
+                offset += self._EVENT_HEADER.size
+                name = data[offset : offset + length].rstrip(b"\0").decode("utf-8", "replace")
+                offset += length
+                # Ignore the journal and other bookkeeping files
+                arrived = arrived or name.endswith(UPDATE_SUFFIXES)
+        return arrived
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
 class DocumentationUpdateManager:
     """Manages processing of documentation update files."""
 
@@ -42,12 +1457,61 @@ class DocumentationUpdateManager:
         dry_run: bool = False,
         verbose: bool = False,
         continue_on_error: bool = True,
+        batch: bool = False,
+        jobs: int = 1,
+        pattern_cache_size: int = 256,
+        atomic: bool = False,
+        journal: Optional[str] = None,
+        metrics_file: Optional[str] = None,
+        metrics_format: str = "json",
+        document_cache_bytes: int = 64 * 1024 * 1024,
+        compact_after_days: Optional[int] = None,
+        retain_days: Optional[int] = None,
+        max_files: Optional[int] = None,
+        time_budget: Optional[float] = None,
+        pipeline: bool = False,
+        diff_output: Optional[str] = None,
+        mmap_threshold_bytes: int = 32 * 1024 * 1024,
+        root: Optional[str] = None,
+        route_updates: bool = True,
+        write_slots: Optional[Any] = None,
+        confine_targets: bool = False,
     ):
         self.updates_dir = Path(updates_dir)
         self.cleanup = cleanup
         self.dry_run = dry_run
         self.verbose = verbose
         self.continue_on_error = continue_on_error
+        self.batch = batch
+        self.jobs = max(1, jobs)
+        self.pipeline = pipeline
+        # Where dry runs write their unified diff: a path, "-" for stdout or None
+        self.diff_output = diff_output
+        # Targets at least this large are edited through a memory map; 0 disables
+        self.mmap_threshold_bytes = mmap_threshold_bytes
+        # Update `file` paths are resolved against this repository root
+        self.root = Path(root) if root is not None else None
+        # When False, outcomes are only counted and queue files never move;
+        # fan-out workers leave archiving the shared queue to the parent
+        self.route_updates = route_updates
+        # Semaphore bounding concurrent document writes across fan-out workers
+        self.write_slots = write_slots
+        # Reject absolute or root-escaping targets as malformed; set in fan-out
+        # runs, where such a target would be written by every worker at once
+        self.confine_targets = confine_targets
+        self.atomic = atomic
+        self.metrics_file = Path(metrics_file) if metrics_file else None
+        self.metrics_format = metrics_format
+        self.timings = StageTimer()
+        # An empty journal path selects the default location in updates_dir
+        if journal is None:
+            self.journal = None
+        else:
+            self.journal = UpdateJournal(
+                Path(journal) if journal else self.updates_dir / "journal.jsonl"
+            )
+        # Digests of written targets for journal entries, kept only when journaling
+        self._digests = TargetDigests(enabled=self.journal is not None)
 
         # Create error isolation directories
         self.processed_dir = self.updates_dir / "processed"
@@ -57,8 +1521,40 @@ class DocumentationUpdateManager:
         # Ensure directories exist
         for dir_path in [self.processed_dir, self.malformed_dir, self.failed_dir]:
             dir_path.mkdir(parents=True, exist_ok=True)
+        self.archive = UpdateArchive(self.updates_dir)
+        # Day shards older than this many days are packed into segments
+        self.compact_after_days = compact_after_days
+        # Archived updates and error logs older than this many days are deleted
+        self.retain_days = retain_days
+        # Limits on how much of the queue one run drains; the rest stays queued
+        self.max_files = max_files
+        self.time_budget = time_budget
+        self._deadline: Optional[float] = None
+        # Queue files and bulk records moved out of the queue this run
+        self._dequeued = 0
 
-        self.stats = {
+        self.stats = self._new_stats()
+        self._patterns = PatternCache(maxsize=pattern_cache_size)
+        # Guards self.stats when target chains run on worker threads
+        self._stats_lock = threading.RLock()
+        # (mode, seconds) from starting each update to archiving it
+        self.latencies: List[Tuple[str, float]] = []
+        # Documents folded in atomic mode, awaiting the commit phase
+        self._staged: List[StagedTarget] = []
+        # Parsed targets, reused across updates, batches and watch cycles
+        self._documents = DocumentCache(max_bytes=document_cache_bytes)
+        # Bulk .ndjson queue files loaded this run, by path
+        self._bulk_queues: Dict[Path, BulkQueue] = {}
+        # Dry-run results per target: original text, folded document, update count
+        self._previews: Dict[Path, Tuple[str, MarkdownDocument, int]] = {}
+
+        if verbose:
+            logger.setLevel(logging.DEBUG)
+
+    @staticmethod
+    def _new_stats() -> Dict[str, Any]:
+        """Return zeroed statistics for one processing run."""
+        return {
             "files_processed": 0,
             "files_malformed": 0,
             "files_failed": 0,
@@ -67,57 +1563,209 @@ class DocumentationUpdateManager:
             "errors": [],
             "malformed_files": [],
             "failed_files": [],
+            "skipped_journaled": 0,
+            "skipped_noop": 0,
+            "noop_files": [],
+            "bytes_written": 0,
+            "stage_timings": {},
+            "pattern_cache_hits": 0,
+            "pattern_cache_misses": 0,
+            "backlog_remaining": False,
+            "skipped_superseded": 0,
+            "superseded_files": [],
         }
 
-        if verbose:
-            logger.setLevel(logging.DEBUG)
+    def _reset_run_state(self) -> None:
+        """Start fresh statistics and timings for another processing run."""
+        self.stats = self._new_stats()
+        self.timings = StageTimer()
+        self.latencies = []
+        self._dequeued = 0
+        self._patterns.hits = self._patterns.misses = 0
+        self.archive.start_run()
+
+    def watch(
+        self,
+        debounce: float = 0.5,
+        max_delay: float = 5.0,
+        poll_interval: float = 1.0,
+    ) -> None:
+        """Process updates continuously as they arrive in the updates directory.
 
-    def process_all_updates(self) -> Dict[str, Any]:
-        """Process all update files in the updates directory with individual error handling."""
+        A burst of arriving files is collected until the directory has been
+        quiet for `debounce` seconds (or `max_delay` has passed since the
+        first file) and then processed as one batched run. Parsed target
+        documents stay in the document cache between runs and are re-read
+        only when their mtime or size changes. Runs until interrupted.
+
+        Failed updates are always moved to failed/ rather than stopping the
+        watcher, so one bad file can neither end the process nor stay queued
+        to stop a restarted one.
+        """
+        self.batch = True
+        self.continue_on_error = True
+        self.updates_dir.mkdir(parents=True, exist_ok=True)
+        watcher = UpdateWatcher(self.updates_dir, poll_interval=poll_interval)
+        logger.info(f"👀 Watching {self.updates_dir} for documentation updates")
+        try:
+            # Drain whatever is already queued before waiting
+            self._drain_queue()
+            while True:
+                if not watcher.wait(timeout=60.0):
+                    continue
+                burst_started = time.monotonic()
+                while time.monotonic() - burst_started < max_delay:
+                    if not watcher.wait(timeout=debounce):
+                        break
+                self._reset_run_state()
+                self._drain_queue()
+        finally:
+            watcher.close()
+
+    def _drain_queue(self) -> None:
+        """Run until the queue is drained or a run moves nothing out of it.
+
+        A backlog left by --max-files/--time-budget is picked up by another
+        run right away, but only while runs make progress; otherwise the
+        watcher waits for the next event instead of spinning.
+        """
+        self.process_all_updates()
+        while self.stats["backlog_remaining"] and self._dequeued:
+            self._reset_run_state()
+            self.process_all_updates()
+
+    def process_all_updates(self, queue: Optional[List[Path]] = None) -> Dict[str, Any]:
+        """Process all update files in the updates directory with individual error handling.
+
+        If a name-sorted queue of update files is given, exactly those are
+        processed instead of what the directory currently lists.
+        """
         logger.info(f"🔄 Processing documentation updates from {self.updates_dir}")
 
         if not self.updates_dir.exists():
             logger.info(f"📝 Updates directory does not exist: {self.updates_dir}")
             return self.stats
 
-        # Find only files in main directory (not subdirectories)
-        update_files = [f for f in self.updates_dir.glob("*.json") if f.is_file()]
-        if not update_files:
-            logger.info("📝 No update files found")
-            return self.stats
+        self._deadline = (
+            time.monotonic() + self.time_budget if self.time_budget is not None else None
+        )
+        files_left = self.max_files
+        found = 0
+        cursor = None
+        # Process files in order (oldest first based on filename/timestamp),
+        # one bounded chunk at a time
+        while True:
+            limit = DISCOVERY_CHUNK_SIZE
+            if files_left is not None:
+                limit = min(limit, files_left)
+            if limit <= 0 or self._out_of_time():
+                if self._next_updates(queue, cursor, 1):
+                    self._defer_backlog()
+                break
 
-        logger.info(f"📊 Found {len(update_files)} update files")
+            update_files = self._next_updates(queue, cursor, limit)
+            if not update_files:
+                break
+            found += len(update_files)
+            logger.info(f"📊 Found {len(update_files)} update files")
 
-        # Process files in order (oldest first based on filename/timestamp)
-        update_files.sort()
+            try:
+                if self.pipeline and not (self.atomic or self.dry_run):
+                    # Overlap reading, transforming and writing across targets
+                    asyncio.run(self._run_pipeline(update_files))
+                elif self.batch or self.jobs > 1 or self.atomic or self.dry_run:
+                    # Split the queue into independent per-target chains
+                    self._process_by_target(update_files)
+                else:
+                    # Process each file individually with error isolation
+                    for update_file in update_files:
+                        if self._out_of_time():
+                            self._defer_backlog()
+                            break
+                        self._process_single_file_safely(update_file)
+            finally:
+                # Also on a stopped run, so settled records are not applied twice
+                self._finish_bulk_queues()
 
-        # Process each file individually with error isolation
-        for update_file in update_files:
-            self._process_single_file_safely(update_file)
+            if self.stats["backlog_remaining"] or len(update_files) < limit:
+                break
+            cursor = update_files[-1].name
+            if files_left is not None:
+                files_left -= len(update_files)
+
+        if self.dry_run:
+            self._report_previews()
+
+        if not found and not self.stats["backlog_remaining"]:
+            logger.info("📝 No update files found")
+            if not self.dry_run:
+                self._maintain_archive()
+            return self.stats
+
+        if not self.dry_run:
+            self._prune_journal()
+            self._maintain_archive()
 
         # Save statistics
+        self.stats["pattern_cache_hits"] = self._patterns.hits
+        self.stats["pattern_cache_misses"] = self._patterns.misses
+        self.stats["stage_timings"] = self.timings.snapshot()
         self._save_stats()
         self._log_processing_summary()
 
         return self.stats
 
+    def _next_updates(
+        self, queue: Optional[List[Path]], after: Optional[str], limit: int
+    ) -> List[Path]:
+        """Return the next chunk of update files, from a given queue or the listing."""
+        if queue is None:
+            return self._discover_updates(after, limit)
+        return [path for path in queue if after is None or path.name > after][:limit]
+
+    def _discover_updates(self, after: Optional[str], limit: int) -> List[Path]:
+        """Return up to limit queue files in name order, after a cursor name.
+
+        Entries are streamed from os.scandir, whose cached d_type answers
+        is_file() without another stat, into a heap that keeps only the
+        `limit` smallest names, so memory stays bounded by the chunk size.
+        """
+        with self.timings.measure("discover"), os.scandir(self.updates_dir) as entries:
+            names = (
+                entry.name
+                for entry in entries
+                if entry.name.endswith(UPDATE_SUFFIXES)
+                and (after is None or entry.name > after)
+                and entry.is_file()
+            )
+            return [self.updates_dir / name for name in heapq.nsmallest(limit, names)]
+
+    def _out_of_time(self) -> bool:
+        """Return True once the run's --time-budget has been used up."""
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    def _defer_backlog(self) -> None:
+        """Note that this run stops with updates still queued."""
+        with self._stats_lock:
+            if self.stats["backlog_remaining"]:
+                return
+            self.stats["backlog_remaining"] = True
+        logger.info("⏳ Run limit reached; remaining updates stay queued for the next run")
+
     def process_update_file(self, update_file: Path) -> None:
         """Process a single update file."""
         logger.debug(f"🔍 Processing: {update_file}")
 
         try:
-            with open(update_file, encoding="utf-8") as f:
-                update_data = json.load(f)
-        except (OSError, json.JSONDecodeError) as e:
+            update_data = _parse_json(update_file.read_bytes())
+        except (OSError, *JSON_ERRORS) as e:
             raise Exception(f"Failed to read update file: {e}")
 
-        # Validate required fields
-        required_fields = ["file", "mode", "content"]
-        for field in required_fields:
-            if field not in update_data:
-                raise Exception(f"Missing required field: {field}")
+        problem = self._validate_update(update_data)
+        if problem:
+            raise Exception(problem)
 
-        target_file = Path(update_data["file"])
+        target_file = _target_path(update_data, self.root)
         mode = update_data["mode"]
         content = update_data["content"]
         options = update_data.get("options", {})
@@ -126,17 +1774,17 @@ class DocumentationUpdateManager:
 
         if self.dry_run:
             logger.info(f"🧪 [DRY RUN] Would update {target_file}")
-            self.stats["files_processed"] += 1
+            self._record_dry_run()
             return
 
         # Apply the update
-        success = self._apply_update(target_file, mode, content, options)
+        outcome = self._apply_update(target_file, mode, content, options)
 
-        if success:
-            self.stats["files_processed"] += 1
-            self.stats["changes_made"] = True
-            if str(target_file) not in self.stats["files_updated"]:
-                self.stats["files_updated"].append(str(target_file))
+        if outcome != UPDATE_FAILED:
+            if outcome == UPDATE_APPLIED:
+                self._record_success(target_file)
+            else:
+                self._record_noop(target_file, update_file)
 
             # Move processed file if cleanup is enabled
             if self.cleanup:
@@ -144,8 +1792,8 @@ class DocumentationUpdateManager:
 
     def _apply_update(
         self, target_file: Path, mode: str, content: str, options: Dict
-    ) -> bool:
-        """Apply an update to a target file."""
+    ) -> str:
+        """Apply an update to a target file and return its outcome."""
         try:
             # Create target file if it doesn't exist
             if not target_file.exists():
@@ -153,127 +1801,1385 @@ class DocumentationUpdateManager:
                 target_file.touch()
                 logger.info(f"📄 Created new file: {target_file}")
 
-            # Read current content
-            try:
-                with open(target_file, encoding="utf-8") as f:
-                    current_content = f.read()
-            except UnicodeDecodeError:
-                # Try with different encoding
-                with open(target_file, encoding="latin-1") as f:
-                    current_content = f.read()
+            # Large targets are edited through a memory map, never loaded whole
+            changed = self._apply_update_mapped(target_file, mode, content, options)
+            if changed is None:
+                # Append-style modes only write the bytes they add
+                changed = self._apply_update_in_place(target_file, mode, content)
+            if changed is None:
+                document, loaded_stat = self._load_document(target_file)
+                revision = document.revision
 
-            # Apply update based on mode
-            new_content = self._apply_mode(current_content, mode, content, options)
+                # Apply update based on mode
+                try:
+                    with self.timings.measure(f"apply:{mode}"):
+                        self._apply_mode_to_document(document, mode, content, options)
+                finally:
+                    changed = document.revision != revision
+                    if not changed and loaded_stat is not None:
+                        self._cache_document(target_file, document, loaded_stat)
+                if changed:
+                    self._write_target(target_file, document.text, document)
 
-            if new_content != current_content:
-                # Write updated content
-                with open(target_file, "w", encoding="utf-8") as f:
-                    f.write(new_content)
+            if changed:
                 logger.info(f"✅ Updated {target_file}")
-                return True
+                return UPDATE_APPLIED
             else:
                 logger.info(f"📄 No changes needed for {target_file}")
+                return self._unchanged_outcome(mode)
+
+        except Exception as e:
+            error_msg = f"Failed to apply update to {target_file}: {str(e)}"
+            logger.error(error_msg)
+            self._record_error(error_msg)
+            return UPDATE_FAILED
+
+    @staticmethod
+    def _unchanged_outcome(mode: str) -> str:
+        """Classify an update that left its target unchanged."""
+        # Idempotent modes are already satisfied; others should have changed it
+        return UPDATE_UNCHANGED if mode in IDEMPOTENT_MODES else UPDATE_FAILED
+
+    @staticmethod
+    def _update_digest(mode: str, content: str, options: Dict) -> str:
+        """Return a digest identifying what an update does, independent of file."""
+        payload = json.dumps([mode, content, options], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _reapplies_cleanly(self, mode: str, content: str) -> bool:
+        """Whether applying an idempotent update twice equals applying it once."""
+        if mode == "replace-section":
+            # A heading inside the new body would move where the section ends
+            return not self._patterns.get("heading").search(content)
+        return mode in IDEMPOTENT_MODES
+
+    def _append_in_place(
+        self, target_file: Path, file_stat: Tuple[int, int], delta: str
+    ) -> None:
+        """Append text to a UTF-8 target, keeping a cached copy in step."""
+        data = delta.encode("utf-8")
+        cached = self._documents.take(target_file, file_stat)
+        with self.timings.measure("write_in_place"):
+            with self._writing(), open(target_file, "ab") as f:
+                f.write(data)
+        self._digests.appended(target_file, file_stat, data)
+        self._record_bytes_written(len(data))
+        if cached is not None:
+            # Keep the cached copy in step with the bytes just appended
+            end = len(cached.document)
+            cached.document.splice(end, end, delta)
+            self._cache_document(target_file, cached.document)
+
+    def _append_to_target(self, target_file: Path, delta: str) -> None:
+        """Append text to a target, in place unless it must be re-encoded."""
+        info = target_file.stat()
+        file_stat = (info.st_mtime_ns, info.st_size)
+        if self._target_encoding(target_file, file_stat) == "utf-8":
+            self._append_in_place(target_file, file_stat, delta)
+            return
+        document, _ = self._load_document(target_file)
+        end = len(document)
+        document.splice(end, end, delta)
+        self._write_target(target_file, document.text, document)
+
+    def _apply_update_in_place(
+        self, target_file: Path, mode: str, content: str
+    ) -> Optional[bool]:
+        """Apply an append-style update without rewriting the whole target.
+
+        append/task-add open the target in append mode and write only the
+        delta. changelog-entry reads up to the ## [Unreleased] heading and
+        rewrites only the tail after it. Returns whether the target changed,
+        or None if the update needs the full read/modify/write path.
+        """
+        if mode not in APPEND_ONLY_MODES and mode != "changelog-entry":
+            return None
+        info = target_file.stat()
+        file_stat = (info.st_mtime_ns, info.st_size)
+        if self._target_encoding(target_file, file_stat) != "utf-8":
+            # A full rewrite re-encodes the document; appending would mix encodings
+            return None
+
+        if mode in APPEND_ONLY_MODES:
+            # The separator only depends on whether the target is empty
+            delta = self._append_delta(mode, content, info.st_size == 0)
+            if not delta:
                 return False
+            self._append_in_place(target_file, file_stat, delta)
+            return True
+
+        # changelog-entry rewrites only the tail after the heading
+        self._documents.discard(target_file)
+        digest = self._digests.hasher()
+        with self._writing(), open(target_file, "r+b") as f:
+            for line in iter(f.readline, b""):
+                if digest is not None:
+                    digest.update(line)
+                if UNRELEASED_HEADING.match(line) and line.endswith(b"\n"):
+                    with self.timings.measure("write_in_place"):
+                        offset = f.tell()
+                        tail = f.read()
+                        data = ("\n" + content + "\n").encode("utf-8") + tail
+                        f.seek(offset)
+                        f.write(data)
+                    break
+            else:
+                # No [Unreleased] section yet; it has to be created
+                return None
+        if digest is not None:
+            digest.update(data)
+        self._digests.wrote(target_file, digest)
+        self._record_bytes_written(len(data))
+        return True
+
+    def _target_encoding(self, target_file: Path, file_stat: Tuple[int, int]) -> str:
+        """Return a target's encoding, from the document cache or its first bytes."""
+        encoding = self._documents.peek_encoding(target_file, file_stat)
+        if encoding is None:
+            with open(target_file, "rb") as f:
+                encoding = _sniff_encoding(f.read(ENCODING_SNIFF_BYTES))
+        return encoding
+
+    def _apply_update_mapped(
+        self, target_file: Path, mode: str, content: str, options: Dict
+    ) -> Optional[bool]:
+        """Apply an anchored update to a large target without loading it.
+
+        The anchor is found in the memory-mapped file and the target is
+        rewritten through a splice writer into a temporary file that replaces
+        it. Returns whether the target changed, or None if the update needs
+        the full read/modify/write path.
+        """
+        if mode not in MAPPED_MODES or not self.mmap_threshold_bytes:
+            return None
+        info = target_file.stat()
+        if info.st_size < self.mmap_threshold_bytes:
+            return None
+        if self._documents.peek_encoding(target_file, (info.st_mtime_ns, info.st_size)):
+            # Already in memory; editing the cached document is cheaper
+            return None
+
+        with MappedTarget(target_file, self._patterns) as mapped:
+            if mapped.has_carriage_returns():
+                return None
+            try:
+                with self.timings.measure(f"apply:{mode}"):
+                    edits = self._mapped_edits(mapped, mode, content, options)
+                if not edits:
+                    return False
+                digest = self._digests.hasher()
+                temp_file = self._stage_spliced(target_file, mapped, edits, digest)
+            except UnicodeDecodeError:
+                # Not UTF-8 past the sniffed prefix; decode it as a whole instead
+                return None
+
+        self._documents.discard(target_file)
+        try:
+            with self.timings.measure("rename"):
+                os.replace(temp_file, target_file)
+        except BaseException:
+            temp_file.unlink(missing_ok=True)
+            raise
+        self._digests.wrote(target_file, digest)
+        logger.debug(f"🗺️ Spliced {len(edits)} edits into {target_file} ({info.st_size} bytes)")
+        return True
+
+    @staticmethod
+    def _mapped_edits(
+        mapped: MappedTarget, mode: str, content: str, options: Dict
+    ) -> List[Tuple[int, int, str]]:
+        """Return the (start, end, text) byte-range edits an update makes.
+
+        Mirrors the document edits of the same modes; an empty list means the
+        target is already up to date.
+        """
+        size = len(mapped)
+        if mode in ("insert-after", "insert-before"):
+            option = "after" if mode == "insert-after" else "before"
+            anchor = options.get(option)
+            if not anchor:
+                raise ValueError(f"{mode} mode requires '{option}' option")
+            offsets = mapped.find_all(anchor)
+            if mode == "insert-before":
+                if not offsets:
+                    return [(0, 0, content + "\n")]
+                return [(offset, offset, content + "\n") for offset in offsets]
+            if not offsets:
+                return [(size, size, "\n" + content)]
+            width = len(mapped.encode(anchor))
+            return [(offset + width, offset + width, "\n" + content) for offset in offsets]
+
+        if mode == "replace-section":
+            section = options.get("section")
+            if not section:
+                raise ValueError("replace-section mode requires 'section' option")
+            found = mapped.find_section(section)
+            if not found:
+                return [(size, size, f"\n\n# {section}\n\n{content}\n")]
+            start, end, level = found
+            new_text = f"{'#' * level} {section}\n\n{content}\n"
+            if mapped.decode(start, end) == new_text:
+                return []
+            return [(start, end, new_text)]
+
+        # changelog-entry
+        unreleased_end, version_start = mapped.changelog_offsets()
+        if unreleased_end is not None:
+            return [(unreleased_end, unreleased_end, "\n" + content + "\n")]
+        unreleased_section = f"## [Unreleased]\n\n{content}\n\n"
+        if version_start is not None:
+            return [(version_start, version_start, unreleased_section)]
+        return [(size, size, "\n" + unreleased_section)]
+
+    def _stage_spliced(
+        self,
+        target_file: Path,
+        mapped: MappedTarget,
+        edits: List[Tuple[int, int, str]],
+        digest: Optional[Any] = None,
+    ) -> Path:
+        """Write a mapped target with edits to a temporary file beside it."""
+        file_mode = stat.S_IMODE(target_file.stat().st_mode)
+        fd, temp_name = tempfile.mkstemp(
+            dir=target_file.parent, prefix=f".{target_file.name}.", suffix=".tmp"
+        )
+        temp_file = Path(temp_name)
+        try:
+            with self._writing(), self.timings.measure("write"), open(fd, "wb") as f:
+                self._record_bytes_written(mapped.write_spliced(f, edits, digest))
+            os.chmod(temp_file, file_mode)
+        except BaseException:
+            temp_file.unlink(missing_ok=True)
+            raise
+        return temp_file
+
+    @staticmethod
+    def _append_delta(mode: str, content: str, target_empty: bool) -> str:
+        """Return the text an append-only mode adds to the end of a target."""
+        if mode == "append":
+            return content if target_empty else "\n" + content
+        # task-add
+        return "\n" + content + "\n"
+
+    @contextmanager
+    def _writing(self) -> Iterator[None]:
+        """Hold one of the shared fan-out write slots, if any, while writing."""
+        if self.write_slots is None:
+            yield
+            return
+        with self.write_slots:
+            yield
+
+    def _read_target(self, target_file: Path) -> Tuple[str, str]:
+        """Read and decode a target document, returning (text, encoding).
+
+        The file is read once and its encoding sniffed from the first bytes,
+        so a latin-1 file is not first decoded as UTF-8 in full. Line endings
+        are normalized to "\\n" as a text mode read would.
+        """
+        if not target_file.exists():
+            return "", "utf-8"
+        with self.timings.measure("read"):
+            raw = target_file.read_bytes()
+            encoding = _sniff_encoding(memoryview(raw)[:ENCODING_SNIFF_BYTES])
+            try:
+                text = raw.decode(encoding)
+            except UnicodeDecodeError:
+                # Invalid UTF-8 past the sniffed prefix
+                text, encoding = raw.decode("latin-1"), "latin-1"
+            if "\r" in text:
+                text = text.replace("\r\n", "\n").replace("\r", "\n")
+            return text, encoding
+
+    def _write_target(
+        self,
+        target_file: Path,
+        content: str,
+        document: Optional[MarkdownDocument] = None,
+    ) -> None:
+        """Write updated content to a target document.
+
+        If the document it came from is given, it is written back into the
+        document cache to serve later updates for the same target.
+        """
+        if not target_file.exists():
+            target_file.parent.mkdir(parents=True, exist_ok=True)
+            logger.info(f"📄 Created new file: {target_file}")
+        self._documents.discard(target_file)
+        with self._writing(), self.timings.measure("write"), open(
+            target_file, "w", encoding="utf-8"
+        ) as f:
+            f.write(content)
+            f.flush()
+            self._record_bytes_written(os.fstat(f.fileno()).st_size)
+        self._digests.wrote_text(target_file, content)
+        if document is not None:
+            self._cache_document(target_file, document)
+
+    def _process_by_target(self, update_files: List[Path]) -> None:
+        """Group update files by target and process each target's chain.
+
+        Chains for different targets share no state, so with jobs > 1 they
+        run on a thread pool; updates within a chain keep filename order.
+        """
+        chains: Dict[Path, List[PendingUpdate]] = {}
+        for update_file in update_files:
+            for pending in self._load_updates(update_file):
+                chains.setdefault(pending.target_file, []).append(pending)
+
+        self._staged = []
+        try:
+            if self.jobs == 1 or len(chains) == 1:
+                for target_file, pending_updates in chains.items():
+                    self._process_target_chain(target_file, pending_updates)
+            else:
+                logger.info(f"🧵 Processing {len(chains)} targets with {self.jobs} workers")
+                with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                    futures = [
+                        executor.submit(
+                            self._process_target_chain, target_file, pending_updates
+                        )
+                        for target_file, pending_updates in chains.items()
+                    ]
+                    for future in futures:
+                        # Re-raise worker errors (only raised when not continuing on error)
+                        future.result()
+        except Exception:
+            # Nothing staged is written when the run stops on an error
+            self._staged = []
+            raise
+
+        if self._staged:
+            self._commit_staged()
+
+    def _process_target_chain(
+        self, target_file: Path, pending_updates: List[PendingUpdate]
+    ) -> None:
+        """Apply one target's updates in order, batched or one at a time."""
+        if self._out_of_time():
+            # The whole chain stays queued for the next run
+            self._defer_backlog()
+            return
+
+        steps = self._plan_chain(pending_updates)
+        if self.dry_run or self.batch or self.atomic:
+            planned = [pending for step in steps for pending in step]
+            if self.dry_run:
+                self._preview_target(target_file, planned)
+            else:
+                self._process_target_batch(target_file, planned)
+            return
+
+        for step in steps:
+            if self._out_of_time():
+                self._defer_backlog()
+                return
+            if len(step) == 1:
+                self._apply_pending_safely(step[0])
+            elif step[0].update_data["mode"] == "task-complete":
+                self._process_target_batch(target_file, step)
+            else:
+                self._apply_append_run(step)
+
+    def _plan_chain(self, pending_updates: List[PendingUpdate]) -> List[List[PendingUpdate]]:
+        """Drop updates that later ones overwrite and group runs of appends.
+
+        A `replace` supersedes the earlier updates for its target that come
+        after the last `task-complete`; a `task-complete` can fail, so it and
+        the updates it depends on are still applied to keep failures
+        reported. A `replace-section` supersedes the update right before it if that
+        replaced the same section with content that has no heading lines, so
+        it cannot have moved where the section ends. Superseded updates are
+        attached to the update that overwrites them and are never applied.
+
+        Returns the remaining updates in order as steps: consecutive
+        append/task-add updates form one step so they can be written at once,
+        and consecutive task-complete updates one step so their tasks can be
+        matched in a single pass.
+        """
+        planned: List[PendingUpdate] = []
+        for pending in pending_updates:
+            mode = pending.update_data["mode"]
+            if mode == "replace" and planned:
+                keep = max(
+                    (
+                        index + 1
+                        for index, earlier in enumerate(planned)
+                        if earlier.update_data["mode"] == "task-complete"
+                    ),
+                    default=0,
+                )
+                for earlier in planned[keep:]:
+                    pending.superseded.extend(earlier.superseded)
+                    pending.superseded.append(earlier)
+                    earlier.superseded = []
+                planned = planned[:keep] + [pending]
+                continue
+            if mode == "replace-section" and planned:
+                previous = planned[-1]
+                section = pending.update_data["options"]["section"]
+                if (
+                    previous.update_data["mode"] == "replace-section"
+                    and previous.update_data["options"]["section"] == section
+                    and self._section_round_trips(section)
+                    and self._reapplies_cleanly("replace-section", previous.update_data["content"])
+                ):
+                    pending.superseded.extend(previous.superseded)
+                    pending.superseded.append(previous)
+                    previous.superseded = []
+                    planned[-1] = pending
+                    continue
+            planned.append(pending)
+
+        steps: List[List[PendingUpdate]] = []
+        for pending in planned:
+            mode = pending.update_data["mode"]
+            previous_mode = steps[-1][-1].update_data["mode"] if steps else None
+            if (mode in APPEND_ONLY_MODES and previous_mode in APPEND_ONLY_MODES) or (
+                mode == previous_mode == "task-complete"
+            ):
+                steps[-1].append(pending)
+            else:
+                steps.append([pending])
+        return steps
+
+    def _section_round_trips(self, section: str) -> bool:
+        """Whether a heading written for this section is found again by its title."""
+        match = self._patterns.get("index").match(f"# {section}")
+        return bool(match and match.group(2) == section and match.end() == len(section) + 2)
+
+    def _apply_append_run(self, run: List[PendingUpdate]) -> None:
+        """Apply consecutive append/task-add updates to one target in one write.
+
+        Each update is still recorded, journaled and archived on its own. An
+        update that would add nothing fails as it does when applied alone;
+        when not continuing on errors, nothing after it is written.
+        """
+        target_file = run[0].target_file
+        applied: List[PendingUpdate] = []
+        failure = None
+        try:
+            if not target_file.exists():
+                target_file.parent.mkdir(parents=True, exist_ok=True)
+                target_file.touch()
+                logger.info(f"📄 Created new file: {target_file}")
+
+            target_empty = target_file.stat().st_size == 0
+            deltas = []
+            for pending in run:
+                update_data = pending.update_data
+                logger.info(f"📝 Updating {target_file} (mode: {update_data['mode']})")
+                pending.started = time.perf_counter()
+                delta = self._append_delta(update_data["mode"], update_data["content"], target_empty)
+                if not delta:
+                    if not self.continue_on_error:
+                        failure = pending
+                        break
+                    self._fail_update(pending.update_file, "Update application failed", pending.line)
+                    continue
+                deltas.append(delta)
+                applied.append(pending)
+                target_empty = False
+
+            if deltas:
+                self._append_to_target(target_file, "".join(deltas))
+                logger.info(f"✅ Updated {target_file} ({len(applied)} updates)")
+        except Exception as e:
+            self._fail_target(target_file, e, applied)
+            return
+
+        if applied:
+            self._journal_applied(target_file, applied)
+        for pending in applied:
+            self._record_success(target_file)
+            if self.cleanup:
+                self._move_to_processed(pending.update_file, pending.line)
+            self._record_latency(pending)
+        if failure is not None:
+            self._fail_update(failure.update_file, "Update application failed", failure.line)
+
+    def _process_target_batch(
+        self, target_file: Path, pending_updates: List[PendingUpdate]
+    ) -> None:
+        """Fold every update for one target over its content and write it once.
+
+        Updates are applied in filename order. An update that raises or leaves
+        the document unchanged is moved to failed/ exactly as in the per-file
+        path; the remaining updates still apply on top of the last good state.
+        """
+        try:
+            document, loaded_stat = self._load_document(target_file)
+        except Exception as e:
+            self._fail_target(target_file, e, pending_updates)
+            return
+
+        applied: List[PendingUpdate] = []
+        unchanged: List[PendingUpdate] = []
+        for pending, outcome in self._fold_updates(target_file, document, pending_updates):
+            if outcome == UPDATE_FAILED:
+                if not self.continue_on_error:
+                    # Keep what was already applied before stopping
+                    self._commit_target_batch(target_file, document, applied, unchanged)
+                self._fail_update(pending.update_file, "Update application failed", pending.line)
+            elif outcome == UPDATE_APPLIED:
+                applied.append(pending)
+            else:
+                unchanged.append(pending)
+
+        if not applied and loaded_stat is not None:
+            # Nothing was written, so the cached copy is still current
+            self._cache_document(target_file, document, loaded_stat)
+        self._commit_target_batch(target_file, document, applied, unchanged)
+
+    def _preview_target(
+        self, target_file: Path, pending_updates: List[PendingUpdate]
+    ) -> None:
+        """Fold a target's updates into an in-memory preview for a dry run.
+
+        The target is read once per run; later chunks keep folding into the
+        same preview. Nothing is written or archived.
+        """
+        with self._stats_lock:
+            preview = self._previews.get(target_file)
+        if preview is None:
+            try:
+                document, loaded_stat = self._load_document(target_file)
+            except Exception as e:
+                error_msg = f"Failed to read {target_file}: {str(e)}"
+                logger.error(error_msg)
+                self._record_error(error_msg)
+                for pending in pending_updates:
+                    self._record_dry_run_failure(pending)
+                return
+            original = document.text
+            if loaded_stat is not None:
+                # The file is not touched, so the cached copy stays current
+                self._cache_document(target_file, document, loaded_stat)
+            preview = (original, MarkdownDocument(original, self._patterns), 0)
+
+        original, document, count = preview
+        for pending, outcome in self._fold_updates(target_file, document, pending_updates):
+            if outcome == UPDATE_APPLIED:
+                self._record_dry_run()
+                count += 1
+            elif outcome == UPDATE_UNCHANGED:
+                self._record_noop(target_file, pending.update_file, pending.line)
+            else:
+                self._record_dry_run_failure(pending)
+                continue
+            for earlier in pending.superseded:
+                self._record_superseded(earlier, pending)
+        with self._stats_lock:
+            self._previews[target_file] = (original, document, count)
+
+    def _report_previews(self) -> None:
+        """Log what a dry run would change and write the unified diff."""
+        previews, self._previews = self._previews, {}
+        patch = []
+        for target_file in sorted(previews):
+            original, document, count = previews[target_file]
+            if document.text == original:
+                continue
+            diff = self._unified_diff(target_file, original, document.text)
+            added = sum(1 for line in diff if line.startswith("+") and not line.startswith("+++"))
+            removed = sum(1 for line in diff if line.startswith("-") and not line.startswith("---"))
+            logger.info(
+                f"🧪 [DRY RUN] Would update {target_file} "
+                f"({count} updates, +{added} -{removed} lines)"
+            )
+            patch.extend(diff)
+
+        if self.diff_output is None:
+            return
+        if self.diff_output == "-":
+            sys.stdout.write("".join(patch))
+            sys.stdout.flush()
+            return
+        try:
+            Path(self.diff_output).write_text("".join(patch), encoding="utf-8")
+            logger.info(f"📝 Wrote dry-run patch to {self.diff_output}")
+        except OSError as e:
+            error_msg = f"Failed to write patch {self.diff_output}: {e}"
+            logger.error(error_msg)
+            self._record_error(error_msg)
+
+    @staticmethod
+    def _unified_diff(target_file: Path, original: str, updated: str) -> List[str]:
+        """Return a git-style unified diff of one target, ready for `git apply`."""
+        exists = target_file.exists()
+        path = target_file.as_posix()
+        diff = []
+        for line in difflib.unified_diff(
+            original.splitlines(keepends=True),
+            updated.splitlines(keepends=True),
+            fromfile=f"a/{path}" if exists else "/dev/null",
+            tofile=f"b/{path}",
+        ):
+            if not line.endswith("\n"):
+                line += "\n\\ No newline at end of file\n"
+            diff.append(line)
+        return diff
+
+    def _fold_updates(
+        self,
+        target_file: Path,
+        document: MarkdownDocument,
+        pending_updates: List[PendingUpdate],
+    ) -> Iterator[Tuple[PendingUpdate, str]]:
+        """Fold updates into an in-memory document in order, yielding outcomes.
+
+        Consecutive task-complete updates are matched against the task lines
+        together in one pass rather than one scan per update.
+        """
+        index = 0
+        while index < len(pending_updates):
+            end = index
+            while (
+                end < len(pending_updates)
+                and pending_updates[end].update_data["mode"] == "task-complete"
+            ):
+                end += 1
+            if end - index > 1:
+                yield from self._fold_task_run(target_file, document, pending_updates[index:end])
+                index = end
+                continue
+            pending = pending_updates[index]
+            yield pending, self._fold_update(target_file, document, pending)
+            index += 1
+
+    def _fold_task_run(
+        self, target_file: Path, document: MarkdownDocument, run: List[PendingUpdate]
+    ) -> Iterator[Tuple[PendingUpdate, str]]:
+        """Fold consecutive task-complete updates with one multi-key match.
+
+        Outcomes are the same as folding the updates one at a time. When not
+        continuing on errors, nothing after the first unmatched key is marked.
+        """
+        keys = [
+            pending.update_data.get("options", {}).get("task_id") or pending.update_data["content"]
+            for pending in run
+        ]
+        if any("\n" in key for key in keys):
+            # Keys spanning lines can only be found by the per-task pattern
+            for pending in run:
+                yield pending, self._fold_update(target_file, document, pending)
+            return
+
+        for pending in run:
+            logger.info(f"📝 Updating {target_file} (mode: task-complete)")
+            pending.started = time.perf_counter()
+        with self.timings.measure("apply:task-complete"):
+            results = self._complete_tasks(document, keys, not self.continue_on_error)
+        completed = sum(count for _, count in results)
+        unmatched = sum(1 for outcome, _ in results if outcome == UPDATE_FAILED)
+        logger.info(
+            f"☑️ Matched {len(results)} task keys in {target_file} in one pass "
+            f"({completed} tasks completed, {unmatched} unmatched)"
+        )
+
+        for pending, key, (outcome, count) in zip(run, keys, results):
+            if outcome == UPDATE_FAILED:
+                error_msg = f"Failed to apply update to {target_file}: No task matching '{key}'"
+                logger.error(error_msg)
+                self._record_error(error_msg)
+            elif outcome == UPDATE_UNCHANGED:
+                logger.info(f"📄 No changes needed for {target_file}")
+            else:
+                logger.debug(f"☑️ Completed {count} tasks matching '{key}' in {target_file}")
+            yield pending, outcome
+
+    def _fold_update(
+        self, target_file: Path, document: MarkdownDocument, pending: PendingUpdate
+    ) -> str:
+        """Apply one update to an in-memory document and return its outcome.
+
+        Errors are logged and recorded and reported as UPDATE_FAILED; routing
+        the failed update is left to the caller.
+        """
+        update_data = pending.update_data
+        mode = update_data["mode"]
+        content = update_data["content"]
+        options = update_data.get("options", {})
+        logger.info(f"📝 Updating {target_file} (mode: {mode})")
+        pending.started = time.perf_counter()
+
+        update_digest = None
+        if mode in IDEMPOTENT_MODES:
+            update_digest = self._update_digest(mode, content, options)
+            if document.is_settled(update_digest):
+                # Same update already applied to this exact revision
+                logger.info(f"📄 No changes needed for {target_file}")
+                return UPDATE_UNCHANGED
+
+        revision = document.revision
+        outcome = UPDATE_APPLIED
+        try:
+            with self.timings.measure(f"apply:{mode}"):
+                self._apply_mode_to_document(document, mode, content, options)
+            if document.revision == revision:
+                logger.info(f"📄 No changes needed for {target_file}")
+                outcome = self._unchanged_outcome(mode)
+        except Exception as e:
+            error_msg = f"Failed to apply update to {target_file}: {str(e)}"
+            logger.error(error_msg)
+            self._record_error(error_msg)
+            return UPDATE_FAILED
+
+        if outcome != UPDATE_FAILED and update_digest and self._reapplies_cleanly(mode, content):
+            document.settle(update_digest)
+        return outcome
+
+    async def _run_pipeline(self, update_files: List[Path]) -> None:
+        """Process updates through overlapping parse, apply and commit stages.
+
+        Update files are read and parsed on a thread pool ahead of the apply
+        stage, which also starts reading each target as soon as its first
+        update is parsed. The apply stage folds updates into in-memory
+        documents on the event loop in queue order, while the commit stage
+        writes and archives them on the pool. Bounded queues between the
+        stages keep memory flat: folded updates carry a snapshot of the
+        document's pieces rather than its text, and the text is joined once
+        per group write. Per target, updates are applied, written and
+        archived in order; every update queued for a target while its last
+        write was in flight is covered by one group write.
+        """
+        loop = asyncio.get_running_loop()
+        parsed: "asyncio.Queue[Optional[PendingUpdate]]" = asyncio.Queue(PIPELINE_QUEUE_SIZE)
+        folded: "asyncio.Queue[Optional[FoldedUpdate]]" = asyncio.Queue(PIPELINE_QUEUE_SIZE)
+        loads: Dict[Path, "asyncio.Future[Tuple[MarkdownDocument, Optional[Tuple[int, int]]]]"] = {}
+        # Document revision last written to each target
+        written: Dict[Path, int] = {}
+        stopping = asyncio.Event()
+
+        with ThreadPoolExecutor(max_workers=self.jobs + 1) as pool:
+            parse_stage = asyncio.create_task(
+                self._pipeline_parse(loop, pool, update_files, parsed, loads)
+            )
+            commit_stage = asyncio.create_task(
+                self._pipeline_commit(loop, pool, folded, written, stopping)
+            )
+            try:
+                documents = await self._pipeline_apply(parsed, folded, loads, stopping)
+            except BaseException:
+                parse_stage.cancel()
+                raise
+            finally:
+                # Everything folded so far still reaches the disk in order
+                await folded.put(None)
+                await commit_stage
+            await parse_stage
+
+        for target_file, (document, loaded_stat, revision) in documents.items():
+            if written.get(target_file) == document.revision:
+                self._cache_document(target_file, document)
+            elif target_file not in written and document.revision == revision and loaded_stat:
+                self._cache_document(target_file, document, loaded_stat)
+
+    async def _pipeline_parse(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        pool: ThreadPoolExecutor,
+        update_files: List[Path],
+        parsed: "asyncio.Queue[Optional[PendingUpdate]]",
+        loads: Dict[Path, "asyncio.Future[Any]"],
+    ) -> None:
+        """Parse stage: read update files ahead on the pool, in queue order."""
+        read_ahead: "deque[asyncio.Future[List[PendingUpdate]]]" = deque()
+        cancelled = False
+        try:
+            for update_file in update_files:
+                if self._out_of_time():
+                    self._defer_backlog()
+                    break
+                read_ahead.append(loop.run_in_executor(pool, self._load_updates, update_file))
+                if len(read_ahead) > self.jobs:
+                    await self._pipeline_emit(loop, pool, await read_ahead.popleft(), parsed, loads)
+            while read_ahead:
+                await self._pipeline_emit(loop, pool, await read_ahead.popleft(), parsed, loads)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            if not cancelled:
+                await parsed.put(None)
+
+    async def _pipeline_emit(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        pool: ThreadPoolExecutor,
+        pending_updates: List[PendingUpdate],
+        parsed: "asyncio.Queue[Optional[PendingUpdate]]",
+        loads: Dict[Path, "asyncio.Future[Any]"],
+    ) -> None:
+        """Hand parsed updates to the apply stage, prefetching new targets."""
+        for pending in pending_updates:
+            if pending.target_file not in loads:
+                # Start reading the target before its first update is applied
+                loads[pending.target_file] = loop.run_in_executor(
+                    pool, self._load_document, pending.target_file
+                )
+            await parsed.put(pending)
+
+    async def _pipeline_apply(
+        self,
+        parsed: "asyncio.Queue[Optional[PendingUpdate]]",
+        folded: "asyncio.Queue[Optional[FoldedUpdate]]",
+        loads: Dict[Path, "asyncio.Future[Any]"],
+        stopping: asyncio.Event,
+    ) -> Dict[Path, Tuple[MarkdownDocument, Optional[Tuple[int, int]], int]]:
+        """Apply stage: fold parsed updates into their target documents in order.
+
+        Returns each target's document with the stat and revision it was
+        loaded at.
+        """
+        documents: Dict[Path, Tuple[MarkdownDocument, Optional[Tuple[int, int]], int]] = {}
+        sequence = 0
+        while (pending := await parsed.get()) is not None:
+            if stopping.is_set():
+                continue
+            sequence += 1
+            target_file = pending.target_file
+            if target_file not in documents:
+                try:
+                    document, loaded_stat = await loads[target_file]
+                except Exception as e:
+                    error_msg = f"Failed to apply update to {target_file}: {str(e)}"
+                    logger.error(error_msg)
+                    self._record_error(error_msg)
+                    await folded.put(FoldedUpdate(pending, UPDATE_FAILED, sequence))
+                    continue
+                documents[target_file] = (document, loaded_stat, document.revision)
+
+            document = documents[target_file][0]
+            size = len(document)
+            outcome = self._fold_update(target_file, document, pending)
+            item = FoldedUpdate(pending, outcome, sequence, document.revision)
+            if outcome == UPDATE_APPLIED:
+                item.snapshot = document.snapshot()
+                if pending.update_data["mode"] in APPEND_ONLY_MODES:
+                    item.appended = document.slice(size, len(document))
+            await folded.put(item)
+            if outcome == UPDATE_FAILED and not self.continue_on_error:
+                # Nothing after the failed update is applied
+                stopping.set()
+        return documents
+
+    async def _pipeline_commit(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        pool: ThreadPoolExecutor,
+        folded: "asyncio.Queue[Optional[FoldedUpdate]]",
+        written: Dict[Path, int],
+        stopping: asyncio.Event,
+    ) -> None:
+        """Commit stage: write and archive folded updates, one writer per target.
+
+        At most `jobs` target writes run at once. Only the newest snapshot
+        queued for a target is kept, as a group write needs no other. The
+        first error raised while stopping on errors is re-raised once the
+        queue is drained.
+
+        When stopping on errors, updates folded before the one that failed
+        are still committed for every target; those folded after it are
+        left queued.
+        """
+        backlog: Dict[Path, List[FoldedUpdate]] = {}
+        newest: Dict[Path, FoldedUpdate] = {}
+        writers: Dict[Path, "asyncio.Task[None]"] = {}
+        slots = asyncio.Semaphore(self.jobs)
+        errors: List[BaseException] = []
+        # Sequence of the last update that may still be committed
+        last = sys.maxsize
+
+        async def drain(target_file: Path) -> None:
+            nonlocal last
+            try:
+                while backlog[target_file]:
+                    group, backlog[target_file] = backlog[target_file], []
+                    # Snapshots of a group being written must stay in place
+                    newest.pop(target_file, None)
+                    group = [item for item in group if item.sequence <= last]
+                    if not group:
+                        continue
+                    async with slots:
+                        try:
+                            failure = await loop.run_in_executor(
+                                pool, self._commit_pipeline_group, target_file, group, written
+                            )
+                        except Exception:
+                            # Nothing from this group on reached the disk
+                            last = min(last, group[0].sequence - 1)
+                            raise
+                    if failure is not None:
+                        self._fail_update(
+                            failure.update_file, "Update application failed", failure.line
+                        )
+            except Exception as e:
+                errors.append(e)
+                stopping.set()
+            finally:
+                del backlog[target_file]
+                del writers[target_file]
+
+        while (item := await folded.get()) is not None:
+            target_file = item.pending.target_file
+            if item.outcome == UPDATE_FAILED and not self.continue_on_error:
+                last = min(last, item.sequence)
+            if item.snapshot is not None:
+                previous = newest.get(target_file)
+                if previous is not None:
+                    previous.snapshot = None
+                newest[target_file] = item
+            backlog.setdefault(target_file, []).append(item)
+            if target_file not in writers:
+                writers[target_file] = asyncio.create_task(drain(target_file))
+        if writers:
+            await asyncio.gather(*writers.values())
+        if errors:
+            raise errors[0]
+
+    def _commit_pipeline_group(
+        self, target_file: Path, group: List[FoldedUpdate], written: Dict[Path, int]
+    ) -> Optional[PendingUpdate]:
+        """Write a target once for a group of folded updates, then archive them.
+
+        A group of only append-style updates appends their text in place;
+        otherwise the last snapshot is joined and the target rewritten.
+
+        Returns the failed update that stops the run, if the group was cut
+        short at one.
+        """
+        failure = None
+        if not self.continue_on_error:
+            for index, item in enumerate(group):
+                if item.outcome == UPDATE_FAILED:
+                    # Commit what came before the failure, then stop
+                    group, failure = group[:index], item.pending
+                    break
+
+        folds = [item for item in group if item.outcome == UPDATE_APPLIED]
+        applied = [item.pending for item in folds]
+        unchanged = [item.pending for item in group if item.outcome == UPDATE_UNCHANGED]
+        if folds:
+            try:
+                if all(item.appended is not None for item in folds) and target_file.exists():
+                    self._append_to_target(target_file, "".join(item.appended for item in folds))
+                elif folds[-1].snapshot is not None:
+                    self._write_target(target_file, MarkdownDocument.join(folds[-1].snapshot))
+                else:
+                    # Cut short by a later failure after its snapshot was
+                    # dropped for a newer one; the group stays queued
+                    return None
+            except Exception as e:
+                self._fail_target(target_file, e, [item.pending for item in group])
+                return None
+            written[target_file] = folds[-1].revision
+            logger.info(f"✅ Updated {target_file} ({len(applied)} updates)")
+
+        for item in group:
+            if item.outcome == UPDATE_FAILED:
+                pending = item.pending
+                self._fail_update(pending.update_file, "Update application failed", pending.line)
+        if applied or unchanged:
+            self._archive_target_batch(target_file, applied, unchanged)
+        return failure
+
+    def _load_document(
+        self, target_file: Path
+    ) -> Tuple[MarkdownDocument, Optional[Tuple[int, int]]]:
+        """Return a target's document and its (mtime_ns, size) when loaded.
+
+        A cached document is reused if the file's mtime and size still match.
+        The entry is taken out of the cache while the document is being
+        edited; callers put it back once it matches the file on disk again.
+        """
+        if not target_file.exists():
+            return MarkdownDocument("", self._patterns), None
+
+        info = target_file.stat()
+        file_stat = (info.st_mtime_ns, info.st_size)
+        cached = self._documents.take(target_file, file_stat)
+        if cached is not None:
+            logger.debug(f"♻️ Using cached document for {target_file}")
+            return cached.document, file_stat
+
+        text, encoding = self._read_target(target_file)
+        document = MarkdownDocument(text, self._patterns)
+        document.encoding = encoding
+        return document, file_stat
+
+    def _cache_document(
+        self,
+        target_file: Path,
+        document: MarkdownDocument,
+        file_stat: Optional[Tuple[int, int]] = None,
+    ) -> None:
+        """Keep a document that matches the file on disk for later updates.
+
+        Without file_stat the document was just written, so it is UTF-8 now
+        and the file is stat'ed for its new mtime and size.
+        """
+        if file_stat is None:
+            try:
+                info = target_file.stat()
+            except OSError:
+                return
+            file_stat = (info.st_mtime_ns, info.st_size)
+            document.encoding = "utf-8"
+        self._documents.put(
+            target_file, CachedDocument(document, document.encoding, file_stat)
+        )
+
+    def _commit_target_batch(
+        self,
+        target_file: Path,
+        document: MarkdownDocument,
+        applied: List[PendingUpdate],
+        unchanged: List[PendingUpdate],
+    ) -> None:
+        """Write a folded target once and archive the updates that built it.
+
+        Unchanged updates were judged against the folded document, so they
+        share the fate of the write.
+        """
+        if not applied and not unchanged:
+            return
+
+        if self.atomic:
+            staged = StagedTarget(
+                target_file, document.text if applied else None, applied, unchanged, document
+            )
+            with self._stats_lock:
+                self._staged.append(staged)
+            return
+
+        if applied:
+            try:
+                self._write_target(target_file, document.text, document)
+            except Exception as e:
+                self._fail_target(target_file, e, applied + unchanged)
+                return
+            logger.info(f"✅ Updated {target_file} ({len(applied)} updates)")
+
+        self._archive_target_batch(target_file, applied, unchanged)
+
+    def _archive_target_batch(
+        self,
+        target_file: Path,
+        applied: List[PendingUpdate],
+        unchanged: List[PendingUpdate],
+    ) -> None:
+        """Journal, count and archive the updates behind a committed target."""
+        superseded = [earlier for pending in applied + unchanged for earlier in pending.superseded]
+        self._journal_applied(target_file, applied + unchanged + superseded)
+        for pending in applied:
+            self._record_success(target_file)
+        for pending in unchanged:
+            self._record_noop(target_file, pending.update_file, pending.line)
+        for pending in applied + unchanged:
+            if self.cleanup:
+                self._move_to_processed(pending.update_file, pending.line)
+            self._record_latency(pending)
+            self._archive_superseded(pending)
+
+    def _commit_staged(self) -> None:
+        """Write all staged documents in one two-phase commit.
+
+        Every document is first written to a temporary file next to its
+        target and the batch is fsynced together. Only then are the temporary
+        files renamed over their targets, and only after all renames are the
+        update files archived. A crash leaves each target either fully old or
+        fully new, with the updates still queued.
+        """
+        staged, self._staged = self._staged, []
+        writes = [target for target in staged if target.content is not None]
+        logger.info(f"💾 Committing {len(writes)} documents")
+
+        prepared: List[StagedTarget] = []
+        try:
+            # Phase 1: stage every document next to its target
+            for target in writes:
+                try:
+                    target.temp_file = self._stage_target(target.target_file, target.content)
+                    prepared.append(target)
+                except Exception as e:
+                    self._fail_target(target.target_file, e, target.updates)
+
+            # Phase 2: make the staged data durable in one batch
+            durable = []
+            for target in prepared:
+                try:
+                    with self.timings.measure("fsync"):
+                        self._fsync_path(target.temp_file)
+                    durable.append(target)
+                except OSError as e:
+                    target.temp_file.unlink(missing_ok=True)
+                    self._fail_target(target.target_file, e, target.updates)
+
+            # Phase 3: swap the documents in and persist the renames
+            committed = [target for target in staged if target.content is None]
+            rename_failures = []
+            for target in durable:
+                try:
+                    self._documents.discard(target.target_file)
+                    with self.timings.measure("rename"):
+                        os.replace(target.temp_file, target.target_file)
+                    committed.append(target)
+                    self._digests.wrote_text(target.target_file, target.content)
+                    self._cache_document(target.target_file, target.document)
+                    logger.info(f"✅ Updated {target.target_file} ({len(target.applied)} updates)")
+                except OSError as e:
+                    target.temp_file.unlink(missing_ok=True)
+                    rename_failures.append((target, e))
+            for directory in {target.target_file.parent for target in durable}:
+                try:
+                    self._fsync_path(directory)
+                except OSError as e:
+                    logger.warning(f"Failed to sync directory {directory}: {e}")
+        except BaseException:
+            # Stopping on an error; remove what was staged but not renamed
+            for target in prepared:
+                target.temp_file.unlink(missing_ok=True)
+            raise
+
+        # Phase 4: only now journal and archive the updates behind each document
+        for target in committed:
+            self._archive_target_batch(target.target_file, target.applied, target.unchanged)
+        # Routing a failure raises when stopping on errors, so it comes last:
+        # documents already renamed must not be left with their updates queued
+        for target, e in rename_failures:
+            self._fail_target(target.target_file, e, target.updates)
+
+    def _stage_target(self, target_file: Path, content: str) -> Path:
+        """Write content to a temporary file beside the target and return it."""
+        if not target_file.exists():
+            target_file.parent.mkdir(parents=True, exist_ok=True)
+            logger.info(f"📄 Created new file: {target_file}")
+            umask = os.umask(0)
+            os.umask(umask)
+            file_mode = 0o666 & ~umask
+        else:
+            file_mode = stat.S_IMODE(target_file.stat().st_mode)
+
+        fd, temp_name = tempfile.mkstemp(
+            dir=target_file.parent, prefix=f".{target_file.name}.", suffix=".tmp"
+        )
+        temp_file = Path(temp_name)
+        try:
+            with self._writing(), self.timings.measure("write"), open(
+                fd, "w", encoding="utf-8"
+            ) as f:
+                f.write(content)
+                f.flush()
+                self._record_bytes_written(os.fstat(f.fileno()).st_size)
+            os.chmod(temp_file, file_mode)
+        except BaseException:
+            temp_file.unlink(missing_ok=True)
+            raise
+        return temp_file
+
+    @staticmethod
+    def _fsync_path(path: Path) -> None:
+        """Flush a file or directory to stable storage."""
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _fail_target(
+        self, target_file: Path, error: Exception, pending_updates: List[PendingUpdate]
+    ) -> None:
+        """Fail every update in a target's chain after a target I/O error."""
+        error_msg = f"Failed to apply update to {target_file}: {str(error)}"
+        logger.error(error_msg)
+        self._record_error(error_msg)
+        for pending in pending_updates:
+            self._fail_update(pending.update_file, "Update application failed", pending.line)
+
+    def _fail_update(self, update_file: Path, error_msg: str, line: int = 0) -> None:
+        """Route an update that could not be applied according to error policy."""
+        if not self.continue_on_error:
+            self._record_error(
+                f"Unexpected error processing {_update_name(update_file, line)}: {error_msg}"
+            )
+            raise Exception(error_msg)
+        self._move_to_failed(update_file, error_msg, line)
+
+    def _record_success(self, target_file: Path) -> None:
+        """Record a successfully applied update in the run statistics."""
+        with self._stats_lock:
+            self.stats["files_processed"] += 1
+            self.stats["changes_made"] = True
+            if str(target_file) not in self.stats["files_updated"]:
+                self.stats["files_updated"].append(str(target_file))
+
+    def _record_noop(self, target_file: Path, update_file: Path, line: int = 0) -> None:
+        """Record an update whose result was already present in its target."""
+        with self._stats_lock:
+            self.stats["skipped_noop"] += 1
+            self.stats["noop_files"].append(_update_name(update_file, line))
+
+    def _archive_superseded(self, pending: PendingUpdate) -> None:
+        """Record and archive the updates a committed update overwrote."""
+        for earlier in pending.superseded:
+            self._record_superseded(earlier, pending)
+            if self.cleanup:
+                self._move_to_processed(earlier.update_file, earlier.line, superseded=True)
+
+    def _record_superseded(self, pending: PendingUpdate, superseded_by: PendingUpdate) -> None:
+        """Record an update that was skipped because a later one overwrites it."""
+        logger.info(f"⏭️ Superseded by {superseded_by.name}: {pending.name}")
+        with self._stats_lock:
+            self.stats["skipped_superseded"] += 1
+            self.stats["superseded_files"].append(pending.name)
+
+    def _record_dry_run(self) -> None:
+        """Record an update that would have been applied in dry-run mode."""
+        with self._stats_lock:
+            self.stats["files_processed"] += 1
+
+    def _record_dry_run_failure(self, pending: PendingUpdate) -> None:
+        """Record an update that would have been moved to failed/ in dry-run mode."""
+        logger.warning(f"❌ [DRY RUN] Would move to failed: {pending.name}")
+        with self._stats_lock:
+            self.stats["files_failed"] += 1
+            self.stats["failed_files"].append(pending.name)
+
+    def _record_bytes_written(self, count: int) -> None:
+        """Add to the number of document bytes written this run."""
+        with self._stats_lock:
+            self.stats["bytes_written"] += count
+
+    def _record_latency(self, pending: PendingUpdate) -> None:
+        """Record how long an update took from start of work to archival."""
+        latency = time.perf_counter() - pending.started
+        with self._stats_lock:
+            self.latencies.append((pending.update_data["mode"], latency))
 
-        except Exception as e:
-            error_msg = f"Failed to apply update to {target_file}: {str(e)}"
-            logger.error(error_msg)
+    def _record_error(self, error_msg: str) -> None:
+        """Record an error message in the run statistics."""
+        with self._stats_lock:
             self.stats["errors"].append(error_msg)
-            return False
 
     def _apply_mode(
         self, current_content: str, mode: str, content: str, options: Dict
     ) -> str:
         """Apply content update based on the specified mode."""
+        document = MarkdownDocument(current_content, self._patterns)
+        self._apply_mode_to_document(document, mode, content, options)
+        return document.text
 
-        if mode == "append":
-            return current_content + "\n" + content if current_content else content
+    def _apply_mode_to_document(
+        self, document: MarkdownDocument, mode: str, content: str, options: Dict
+    ) -> None:
+        """Apply an update to a document in place based on the specified mode.
+
+        Options are validated before any edit, so a failing update leaves the
+        document untouched.
+        """
+        size = len(document)
+
+        if mode in APPEND_ONLY_MODES:
+            delta = self._append_delta(mode, content, not size)
+            document.splice(size, size, delta)
 
         elif mode == "prepend":
-            return content + "\n" + current_content if current_content else content
+            document.splice(0, 0, content + "\n" if size else content)
 
         elif mode == "replace":
-            return content
+            document.splice(0, size, content)
 
         elif mode == "replace-section":
             section = options.get("section")
             if not section:
                 raise ValueError("replace-section mode requires 'section' option")
-            return self._replace_section(current_content, section, content)
+            self._replace_section(document, section, content)
 
         elif mode == "insert-after":
             after_text = options.get("after")
             if not after_text:
                 raise ValueError("insert-after mode requires 'after' option")
-            return self._insert_after(current_content, after_text, content)
+            self._insert_after(document, after_text, content)
 
         elif mode == "insert-before":
             before_text = options.get("before")
             if not before_text:
                 raise ValueError("insert-before mode requires 'before' option")
-            return self._insert_before(current_content, before_text, content)
+            self._insert_before(document, before_text, content)
 
         elif mode == "changelog-entry":
-            return self._add_changelog_entry(current_content, content)
-
-        elif mode == "task-add":
-            return self._add_todo_task(current_content, content)
+            self._add_changelog_entry(document, content)
 
         elif mode == "task-complete":
             task_id = options.get("task_id")
-            return self._complete_todo_task(current_content, content, task_id)
+            self._complete_todo_task(document, content, task_id)
 
         elif mode == "update-badge":
             badge_name = options.get("badge_name")
             if not badge_name:
                 raise ValueError("update-badge mode requires 'badge_name' option")
-            return self._update_badge(current_content, badge_name, content)
+            self._update_badge(document, badge_name, content)
 
         else:
             raise ValueError(f"Unknown update mode: {mode}")
 
-    def _replace_section(self, content: str, section: str, new_content: str) -> str:
-        """Replace a specific section in the content."""
-        # Pattern to match markdown sections
-        pattern = rf"(^#{1, 6}\s+{re.escape(section)}\s*$.*?)(?=^#{1, 6}\s+|\Z)"
-
-        if re.search(pattern, content, re.MULTILINE | re.DOTALL):
-            return re.sub(
-                pattern,
-                f"# {section}\n\n{new_content}\n",
-                content,
-                flags=re.MULTILINE | re.DOTALL,
-            )
+    def _replace_section(
+        self, document: MarkdownDocument, section: str, new_content: str
+    ) -> None:
+        """Replace a specific section in the document."""
+        found = document.find_section(section)
+        if found:
+            start, end, level = found
+            document.splice(start, end, f"{'#' * level} {section}\n\n{new_content}\n")
         else:
             # Section doesn't exist, append it
-            return content + f"\n\n# {section}\n\n{new_content}\n"
+            end = len(document)
+            document.splice(end, end, f"\n\n# {section}\n\n{new_content}\n")
 
-    def _insert_after(self, content: str, after_text: str, new_content: str) -> str:
-        """Insert content after specified text."""
-        if after_text in content:
-            return content.replace(after_text, after_text + "\n" + new_content)
+    def _insert_after(
+        self, document: MarkdownDocument, after_text: str, new_content: str
+    ) -> None:
+        """Insert content after every occurrence of the specified text."""
+        offsets = self._find_all(document.text, after_text)
+        if offsets:
+            insert = "\n" + new_content
+            document.splice_many(
+                [(o + len(after_text), o + len(after_text), insert) for o in offsets]
+            )
         else:
             # If text not found, append to end
-            return content + "\n" + new_content
+            end = len(document)
+            document.splice(end, end, "\n" + new_content)
 
-    def _insert_before(self, content: str, before_text: str, new_content: str) -> str:
-        """Insert content before specified text."""
-        if before_text in content:
-            return content.replace(before_text, new_content + "\n" + before_text)
+    def _insert_before(
+        self, document: MarkdownDocument, before_text: str, new_content: str
+    ) -> None:
+        """Insert content before every occurrence of the specified text."""
+        offsets = self._find_all(document.text, before_text)
+        if offsets:
+            insert = new_content + "\n"
+            document.splice_many([(o, o, insert) for o in offsets])
         else:
             # If text not found, prepend to beginning
-            return new_content + "\n" + content
+            document.splice(0, 0, new_content + "\n")
 
-    def _add_changelog_entry(self, content: str, entry: str) -> str:
-        """Add entry to changelog under [Unreleased] section."""
-        unreleased_pattern = r"(## \[Unreleased\].*?\n)(.*?)(?=\n## |\Z)"
+    @staticmethod
+    def _find_all(text: str, needle: str) -> List[int]:
+        """Return the offsets of all non-overlapping occurrences of needle."""
+        offsets = []
+        position = text.find(needle)
+        while position != -1:
+            offsets.append(position)
+            position = text.find(needle, position + len(needle))
+        return offsets
 
-        match = re.search(unreleased_pattern, content, re.DOTALL)
-        if match:
-            # Insert entry in unreleased section
-            return content.replace(
-                match.group(0), match.group(1) + "\n" + entry + "\n" + match.group(2)
-            )
+    def _add_changelog_entry(self, document: MarkdownDocument, entry: str) -> None:
+        """Add entry to changelog under [Unreleased] section."""
+        unreleased_end, version_start = document.changelog_offsets()
+        if unreleased_end is not None:
+            # Insert entry right below the unreleased heading
+            document.splice(unreleased_end, unreleased_end, "\n" + entry + "\n")
         else:
             # No unreleased section, add it
             unreleased_section = f"""## [Unreleased]
@@ -281,110 +3187,394 @@ class DocumentationUpdateManager:
 {entry}
 
 """
-            # Find the first version section and insert before it
-            version_pattern = r"(## \[[\d\.]+\])"
-            if re.search(version_pattern, content):
-                return re.sub(
-                    version_pattern, unreleased_section + r"\1", content, count=1
-                )
+            if version_start is not None:
+                # Insert before the first version section
+                document.splice(version_start, version_start, unreleased_section)
             else:
                 # No version sections, append to end
-                return content + "\n" + unreleased_section
-
-    def _add_todo_task(self, content: str, task: str) -> str:
-        """Add a task to TODO list."""
-        # Find the first incomplete task section or append to end
-        return content + "\n" + task + "\n"
+                end = len(document)
+                document.splice(end, end, "\n" + unreleased_section)
 
     def _complete_todo_task(
-        self, content: str, task_description: str, task_id: Optional[str]
-    ) -> str:
-        """Mark a TODO task as complete."""
+        self, document: MarkdownDocument, task_description: str, task_id: Optional[str]
+    ) -> None:
+        """Mark a TODO task as complete, matching by ID or else by description."""
+        task_key = task_id or task_description
+        pattern = self._patterns.get("task-complete", task_key)
+        # Only task lines are read, unless the key itself spans lines
+        text = document.text if "\n" in task_key else None
+        edits = []
+        for offset in document.open_task_offsets():
+            match = self._match_task_line(document, pattern, offset, text)
+            if match:
+                marker = offset + match.end(1) - match.start() + 2
+                edits.append((marker, marker + 3, "[x]"))
+        if edits:
+            document.splice_many(edits)
+            return
 
-        def mark_complete(match):
-            return match.group(0).replace("[ ]", "[x]")
+        # Nothing left to complete: fine if the task was already checked off
+        done_pattern = self._patterns.get("task-done", task_key)
+        if not any(
+            self._match_task_line(document, done_pattern, offset, text)
+            for offset in document.done_task_offsets()
+        ):
+            raise ValueError(f"No task matching '{task_key}'")
 
-        if task_id:
-            # Find task by ID and mark complete
-            pattern = rf"- \[ \] .*{re.escape(task_id)}.*"
-            return re.sub(pattern, mark_complete, content)
-        else:
-            # Find task by description and mark complete
-            pattern = rf"- \[ \] .*{re.escape(task_description)}.*"
-            return re.sub(pattern, mark_complete, content)
+    @staticmethod
+    def _match_task_line(
+        document: MarkdownDocument,
+        pattern: "re.Pattern[str]",
+        offset: int,
+        text: Optional[str],
+    ) -> Optional["re.Match[str]"]:
+        """Match a task pattern at a task line, against the full text if given."""
+        if text is not None:
+            return pattern.match(text, offset)
+        return pattern.match(document.line_at(offset))
+
+    def _complete_tasks(
+        self, document: MarkdownDocument, task_keys: List[str], stop_on_failure: bool
+    ) -> List[Tuple[str, int]]:
+        """Mark open tasks mentioning any of several keys in one pass.
+
+        Returns an (outcome, tasks completed) pair per key, as if the keys
+        were completed one after another: a key whose tasks were all completed
+        by earlier keys, or were already checked off, is unchanged, and a key
+        matching no task fails. With stop_on_failure, the results end at the
+        first failure and later keys mark nothing.
+        """
+        matcher = KeywordMatcher(task_keys)
+        markers_by_key: Dict[int, List[int]] = {}
+        for marker, key_indices in self._task_key_hits(
+            document, document.open_task_offsets(), matcher
+        ):
+            for key_index in key_indices:
+                markers_by_key.setdefault(key_index, []).append(marker)
 
-    def _update_badge(self, content: str, badge_name: str, badge_content: str) -> str:
+        done_keys: Optional[Set[int]] = None
+        marked: Set[int] = set()
+        results: List[Tuple[str, int]] = []
+        for key_index in range(len(task_keys)):
+            markers = markers_by_key.get(key_index, [])
+            fresh = [marker for marker in markers if marker not in marked]
+            if fresh:
+                marked.update(fresh)
+                results.append((UPDATE_APPLIED, len(fresh)))
+                continue
+            if not markers:
+                if done_keys is None:
+                    # Only needed once some key has no open task left
+                    done_keys = set()
+                    for _, key_indices in self._task_key_hits(
+                        document, document.done_task_offsets(), matcher
+                    ):
+                        done_keys.update(key_indices)
+                if key_index not in done_keys:
+                    results.append((UPDATE_FAILED, 0))
+                    if stop_on_failure:
+                        break
+                    continue
+            results.append((UPDATE_UNCHANGED, 0))
+
+        if marked:
+            document.splice_many([(marker, marker + 3, "[x]") for marker in sorted(marked)])
+        return results
+
+    @staticmethod
+    def _task_key_hits(
+        document: MarkdownDocument, offsets: List[int], matcher: KeywordMatcher
+    ) -> Iterator[Tuple[int, Set[int]]]:
+        """Yield each task line's checkbox offset and the keys its text mentions."""
+        for offset in offsets:
+            line = document.line_at(offset)
+            checkbox = line.index("- [") + 2
+            # The key must follow the "[ ] " checkbox on the same line
+            yield offset + checkbox, matcher.search(line, checkbox + 4)
+
+    def _update_badge(
+        self, document: MarkdownDocument, badge_name: str, badge_content: str
+    ) -> None:
         """Update or add a badge in README."""
         # This is a simplified implementation
         # In practice, you'd want more sophisticated badge updating
-        return content + f"\n{badge_content}\n"
+        if badge_content in document.text:
+            return
+        end = len(document)
+        document.splice(end, end, f"\n{badge_content}\n")
 
-    def _move_to_processed(self, update_file: Path) -> None:
-        """Move successfully processed file to processed directory."""
-        try:
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            processed_name = f"{timestamp}_{update_file.name}"
-            processed_path = self.processed_dir / processed_name
+    def _move_to_processed(
+        self, update_file: Path, line: int = 0, superseded: bool = False
+    ) -> None:
+        """Move successfully processed file to processed directory.
 
-            shutil.move(str(update_file), str(processed_path))
-            logger.debug(f"📦 Moved to processed: {processed_name}")
+        Superseded updates are archived as <stem>.superseded<suffix>.
+        """
+        if not self.route_updates:
+            return
+        if line:
+            # The bulk file is archived whole once all its records are done
+            self._bulk_queues[update_file].remove(line)
+            self._note_dequeued()
+            return
+        try:
+            name = update_file.name
+            if superseded:
+                name = f"{update_file.stem}.superseded{update_file.suffix}"
+            with self.timings.measure("archive"):
+                processed_path = self.archive.path_for(self.processed_dir, name, datetime.now())
+                shutil.move(str(update_file), str(processed_path))
+            self._note_dequeued()
+            logger.debug(f"📦 Moved to processed: {processed_path.name}")
         except Exception as e:
             logger.warning(f"Failed to move {update_file.name} to processed: {e}")
 
-    def _move_to_malformed(self, update_file: Path, error_msg: str) -> None:
+    def _move_to_malformed(self, update_file: Path, error_msg: str, line: int = 0) -> None:
         """Move malformed file to malformed directory with error info."""
-        logger.warning(f"⚠️ Malformed file: {update_file.name} - {error_msg}")
+        update_name = _update_name(update_file, line)
+        logger.warning(f"⚠️ Malformed file: {update_name} - {error_msg}")
 
-        self.stats["files_malformed"] += 1
-        self.stats["malformed_files"].append(update_file.name)
-        self.stats["errors"].append(f"Malformed file {update_file.name}: {error_msg}")
+        with self._stats_lock:
+            self.stats["files_malformed"] += 1
+            self.stats["malformed_files"].append(update_name)
+            self.stats["errors"].append(f"Malformed file {update_name}: {error_msg}")
+        if not self.route_updates:
+            return
 
         try:
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            malformed_name = f"{timestamp}_{update_file.name}"
-            malformed_path = self.malformed_dir / malformed_name
-
-            # Create error info file
-            error_file = self.malformed_dir / f"{timestamp}_{update_file.stem}_error.txt"
-            with open(error_file, "w", encoding="utf-8") as f:
-                f.write(f"File: {update_file.name}\n")
-                f.write(f"Error: {error_msg}\n")
-                f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-
-            shutil.move(str(update_file), str(malformed_path))
-            logger.debug(f"� Moved to malformed: {malformed_name}")
+            now = datetime.now()
+            stem = f"{update_file.stem}_line{line}" if line else update_file.stem
+            with self.timings.measure("archive"):
+                malformed_path = self.archive.path_for(
+                    self.malformed_dir, f"{stem}{update_file.suffix}", now
+                )
+                if line:
+                    self._split_bulk_record(update_file, line, malformed_path)
+                else:
+                    shutil.move(str(update_file), str(malformed_path))
+            self._note_dequeued()
+            self._log_archive_error("malformed", update_file, line, error_msg, malformed_path, now)
+            logger.debug(f"� Moved to malformed: {malformed_path.name}")
         except Exception as e:
-            logger.warning(f"Failed to move {update_file.name} to malformed: {e}")
+            logger.warning(f"Failed to move {update_name} to malformed: {e}")
 
-    def _move_to_failed(self, update_file: Path, error_msg: str) -> None:
+    def _move_to_failed(self, update_file: Path, error_msg: str, line: int = 0) -> None:
         """Move failed file to failed directory with error info."""
-        logger.warning(f"❌ Failed file: {update_file.name} - {error_msg}")
+        update_name = _update_name(update_file, line)
+        logger.warning(f"❌ Failed file: {update_name} - {error_msg}")
 
-        self.stats["files_failed"] += 1
-        self.stats["failed_files"].append(update_file.name)
-        self.stats["errors"].append(f"Failed file {update_file.name}: {error_msg}")
+        with self._stats_lock:
+            self.stats["files_failed"] += 1
+            self.stats["failed_files"].append(update_name)
+            self.stats["errors"].append(f"Failed file {update_name}: {error_msg}")
+        if not self.route_updates:
+            return
 
         try:
-            from datetime import datetime
-            import traceback
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            failed_name = f"{timestamp}_{update_file.name}"
-            failed_path = self.failed_dir / failed_name
-
-            # Create error info file
-            error_file = self.failed_dir / f"{timestamp}_{update_file.stem}_error.txt"
-            with open(error_file, "w", encoding="utf-8") as f:
-                f.write(f"File: {update_file.name}\n")
-                f.write(f"Error: {error_msg}\n")
-                f.write(f"Timestamp: {datetime.now().isoformat()}\n")
-                f.write(f"Stack trace:\n{traceback.format_exc()}")
-
-            shutil.move(str(update_file), str(failed_path))
-            logger.debug(f"❌ Moved to failed: {failed_name}")
+            now = datetime.now()
+            stack_trace = traceback.format_exc()
+            stem = f"{update_file.stem}_line{line}" if line else update_file.stem
+            with self.timings.measure("archive"):
+                failed_path = self.archive.path_for(
+                    self.failed_dir, f"{stem}{update_file.suffix}", now
+                )
+                if line:
+                    self._split_bulk_record(update_file, line, failed_path)
+                else:
+                    shutil.move(str(update_file), str(failed_path))
+            self._note_dequeued()
+            self._log_archive_error(
+                "failed", update_file, line, error_msg, failed_path, now, stack_trace
+            )
+            logger.debug(f"❌ Moved to failed: {failed_path.name}")
         except Exception as e:
-            logger.warning(f"Failed to move {update_file.name} to failed: {e}")
+            logger.warning(f"Failed to move {update_name} to failed: {e}")
+
+    def _note_dequeued(self) -> None:
+        """Count a queue file or bulk record that left the queue."""
+        with self._stats_lock:
+            self._dequeued += 1
+
+    def _log_archive_error(
+        self,
+        category: str,
+        update_file: Path,
+        line: int,
+        error_msg: str,
+        archived_path: Path,
+        now: datetime,
+        stack_trace: Optional[str] = None,
+    ) -> None:
+        """Record why an update was archived as malformed or failed."""
+        entry = {
+            "category": category,
+            "file": update_file.name,
+            "error": error_msg,
+            "archived_as": str(archived_path.relative_to(self.updates_dir)),
+            "timestamp": now.isoformat(),
+        }
+        if line:
+            entry["line"] = line
+        if stack_trace and stack_trace != "NoneType: None\n":
+            entry["stack_trace"] = stack_trace
+        try:
+            self.archive.log_error(entry)
+        except OSError as e:
+            logger.warning(f"Failed to write error log {self.archive.error_log}: {e}")
+
+    def _prune_journal(self) -> None:
+        """Drop journal entries for updates that are no longer queued.
+
+        A journal entry only keeps a queued update from being applied twice;
+        once the update has been archived the entry is never consulted again.
+        """
+        if self.journal is None:
+            return
+
+        def still_queued(entry: Dict[str, Any]) -> bool:
+            # Bulk records are named <file>:<line>
+            name = str(entry.get("file", ""))
+            file_name, _, line = name.rpartition(":")
+            if not (file_name and line.isdigit()):
+                file_name = name
+            return (self.updates_dir / file_name).exists()
+
+        try:
+            pruned = self.journal.prune(still_queued)
+        except OSError as e:
+            logger.warning(f"Failed to prune journal {self.journal.path}: {e}")
+            return
+        if pruned:
+            logger.info(f"🧹 Pruned {pruned} entries for archived updates from the journal")
+
+    def _maintain_archive(self) -> None:
+        """Compact and prune the archive according to the configured ages."""
+        if self.compact_after_days is None and self.retain_days is None:
+            return
+        today = date.today()
+        for category_dir in (self.processed_dir, self.malformed_dir, self.failed_dir):
+            try:
+                moved = self.archive.shard_flat_files(category_dir)
+                if moved:
+                    logger.info(f"🗂️ Moved {moved} archived files into date shards in {category_dir}")
+                if self.retain_days is not None:
+                    pruned = self.archive.prune(category_dir, today - timedelta(days=self.retain_days))
+                    if pruned:
+                        logger.info(f"🧹 Pruned {pruned} archive shards from {category_dir}")
+                if self.compact_after_days is not None:
+                    compacted = self.archive.compact(
+                        category_dir, today - timedelta(days=self.compact_after_days)
+                    )
+                    if compacted:
+                        logger.info(f"🗜️ Compacted {compacted} day shards in {category_dir}")
+            except OSError as e:
+                logger.warning(f"Failed to maintain archive {category_dir}: {e}")
+        if self.retain_days is not None:
+            try:
+                self.archive.prune_error_logs(today - timedelta(days=self.retain_days))
+            except OSError as e:
+                logger.warning(f"Failed to prune error logs: {e}")
+
+    def _split_bulk_record(self, update_file: Path, line: int, destination: Path) -> None:
+        """Write one bulk record to its own single-line file and dequeue it."""
+        bulk_queue = self._bulk_queues[update_file]
+        with open(destination, "wb") as f:
+            f.write(bulk_queue.record(line) + b"\n")
+        bulk_queue.remove(line, split=True)
+
+    def _finish_bulk_queues(self) -> None:
+        """Archive fully processed bulk files and trim the rest.
+
+        A bulk file whose records have all left the queue is archived to
+        processed/, without the records already split out to failed/ or
+        malformed/. Otherwise it is atomically rewritten with the records
+        that left replaced by blank lines, so a rerun never applies a record
+        twice. Records are journaled by line, so the ones still queued must
+        not be renumbered.
+        """
+        bulk_queues, self._bulk_queues = self._bulk_queues, {}
+        for bulk_queue in bulk_queues.values():
+            if self.dry_run or not self.route_updates or not bulk_queue.touched:
+                continue
+            remaining = bulk_queue.remaining()
+            if not remaining:
+                if not bulk_queue.split:
+                    self._move_to_processed(bulk_queue.path)
+                    continue
+                lines = bulk_queue.processed_lines()
+                if not lines:
+                    # Every record was archived on its own
+                    self._remove_bulk_queue(bulk_queue.path)
+                    continue
+            else:
+                lines = bulk_queue.queued_lines()
+            try:
+                self._rewrite_bulk_queue(bulk_queue.path, lines)
+            except OSError as e:
+                logger.warning(f"Failed to rewrite bulk queue {bulk_queue.path.name}: {e}")
+                continue
+            if remaining:
+                logger.debug(
+                    f"📦 {len(remaining)} records left queued in {bulk_queue.path.name}"
+                )
+            else:
+                self._move_to_processed(bulk_queue.path)
+
+    @staticmethod
+    def _rewrite_bulk_queue(path: Path, lines: List[bytes]) -> None:
+        """Atomically replace a bulk file's contents with lines."""
+        temp_file = path.with_name(f".{path.name}.tmp")
+        temp_file.write_bytes(b"".join(raw + b"\n" for raw in lines))
+        os.replace(temp_file, path)
+
+    @staticmethod
+    def _remove_bulk_queue(path: Path) -> None:
+        """Delete a bulk file whose records were all archived elsewhere."""
+        try:
+            path.unlink()
+        except OSError as e:
+            logger.warning(f"Failed to remove bulk queue {path.name}: {e}")
+
+    def _archive_fan_out(
+        self, queue: List[Path], per_repo: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """Archive a queue shared by fan-out workers once all repos are done.
+
+        An update that failed in any repository goes to failed/, naming the
+        repositories; the rest go to processed/ with cleanup on, marked as
+        superseded if every repository skipped them. If a repository's run
+        stopped early, the queue is left as it is.
+        """
+        stopped = [root for root, stats in per_repo.items() if stats["backlog_remaining"]]
+        if stopped:
+            logger.warning(
+                f"⚠️ Leaving the update queue in place; runs stopped early in: {', '.join(stopped)}"
+            )
+            return
+
+        failed_in: Dict[str, List[str]] = {}
+        superseded_in: Dict[str, int] = {}
+        for root, stats in per_repo.items():
+            for name in stats["failed_files"]:
+                failed_in.setdefault(name, []).append(root)
+            for name in stats["superseded_files"]:
+                superseded_in[name] = superseded_in.get(name, 0) + 1
+
+        for update_file in queue:
+            # Malformed records are routed by the load itself, as in the workers
+            for pending in self._load_updates(update_file):
+                roots = failed_in.get(pending.name)
+                if roots:
+                    self._move_to_failed(
+                        update_file,
+                        f"Failed in {len(roots)} of {len(per_repo)} repositories: "
+                        f"{', '.join(roots)}",
+                        pending.line,
+                    )
+                elif self.cleanup:
+                    superseded = superseded_in.get(pending.name) == len(per_repo)
+                    self._move_to_processed(update_file, pending.line, superseded=superseded)
+            self._finish_bulk_queues()
 
     def _log_processing_summary(self) -> None:
         """Log comprehensive processing summary."""
@@ -392,6 +3582,11 @@ class DocumentationUpdateManager:
         logger.info(f"   Files processed successfully: {self.stats['files_processed']}")
         logger.info(f"   Files with malformed data: {self.stats['files_malformed']}")
         logger.info(f"   Files that failed processing: {self.stats['files_failed']}")
+        logger.info(f"   Files already satisfied (no-op): {self.stats['skipped_noop']}")
+        if self.journal is not None:
+            logger.info(f"   Files already applied (journal): {self.stats['skipped_journaled']}")
+        if self.stats["skipped_superseded"]:
+            logger.info(f"   Files superseded by later updates: {self.stats['skipped_superseded']}")
         logger.info(f"   Documentation files updated: {len(self.stats['files_updated'])}")
         logger.info(f"   Changes made to repository: {self.stats['changes_made']}")
 
@@ -410,51 +3605,80 @@ class DocumentationUpdateManager:
         self._move_to_processed(update_file)
 
     def _save_stats(self) -> None:
-        """Save processing statistics (disabled to prevent merge conflicts)."""
-        # Stats file generation disabled to prevent merge conflicts in multi-repo setups
-        pass
+        """Export processing metrics to the configured metrics file.
+
+        Nothing is written inside the repository to prevent merge conflicts in
+        multi-repo setups; metrics only go to an explicit --metrics-file,
+        which should live outside the checkout (e.g. a node_exporter textfile
+        collector directory).
+        """
+        if self.metrics_file is None:
+            return
+
+        if self.metrics_format == "prometheus":
+            payload = self._format_prometheus_metrics()
+        else:
+            metrics = {key: value for key, value in self.stats.items() if key != "errors"}
+            metrics["error_count"] = len(self.stats["errors"])
+            payload = json.dumps(metrics, indent=2, sort_keys=True) + "\n"
+
+        try:
+            self.metrics_file.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so collectors never read a partial file
+            temp_file = self.metrics_file.with_name(f".{self.metrics_file.name}.tmp")
+            temp_file.write_text(payload, encoding="utf-8")
+            os.replace(temp_file, self.metrics_file)
+            logger.debug(f"📈 Wrote metrics to {self.metrics_file}")
+        except OSError as e:
+            logger.warning(f"Failed to write metrics to {self.metrics_file}: {e}")
+
+    def _format_prometheus_metrics(self) -> str:
+        """Render run statistics and stage timings in Prometheus text format."""
+        stats = self.stats
+        lines = [
+            "# HELP doc_update_files_total Update files by outcome in the last run.",
+            "# TYPE doc_update_files_total gauge",
+        ]
+        outcomes = {
+            "processed": stats["files_processed"],
+            "malformed": stats["files_malformed"],
+            "failed": stats["files_failed"],
+            "noop": stats["skipped_noop"],
+            "journaled": stats["skipped_journaled"],
+            "superseded": stats["skipped_superseded"],
+        }
+        for outcome, count in outcomes.items():
+            lines.append(f'doc_update_files_total{{outcome="{outcome}"}} {count}')
+
+        scalars = [
+            ("doc_update_bytes_written", "Document bytes written in the last run.", stats["bytes_written"]),
+            ("doc_update_errors", "Errors recorded in the last run.", len(stats["errors"])),
+            ("doc_update_pattern_cache_hits", "Pattern cache hits in the last run.", stats["pattern_cache_hits"]),
+            ("doc_update_pattern_cache_misses", "Pattern cache misses in the last run.", stats["pattern_cache_misses"]),
+        ]
+        for name, help_text, value in scalars:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+
+        stage_metrics = [
+            ("doc_update_stage_calls", "Calls per pipeline stage in the last run.", "count"),
+            ("doc_update_stage_seconds", "Wall time per pipeline stage in the last run.", "total_s"),
+            ("doc_update_stage_max_seconds", "Longest single call per pipeline stage.", "max_s"),
+        ]
+        for name, help_text, field in stage_metrics:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            for stage, aggregate in stats["stage_timings"].items():
+                lines.append(f'{name}{{stage="{stage}"}} {aggregate[field]}')
+        return "\n".join(lines) + "\n"
 
     def _process_single_file_safely(self, update_file: Path) -> None:
         """Process a single file with comprehensive error handling and immediate archival."""
         logger.debug(f"🔍 Processing: {update_file.name}")
 
         try:
-            # Step 1: Try to parse JSON and validate
-            try:
-                with open(update_file, encoding="utf-8") as f:
-                    update_data = json.load(f)
-            except (OSError, json.JSONDecodeError) as e:
-                # Don't move files in dry-run mode
-                if not self.dry_run:
-                    self._move_to_malformed(update_file, f"JSON parse error: {e}")
-                else:
-                    logger.warning(f"⚠️ [DRY RUN] Would move to malformed: {update_file.name} - JSON parse error: {e}")
-                return
-
-            # Step 2: Validate required fields
-            required_fields = ["file", "mode", "content"]
-            for field in required_fields:
-                if field not in update_data:
-                    # Don't move files in dry-run mode
-                    if not self.dry_run:
-                        self._move_to_malformed(update_file, f"Missing required field: {field}")
-                    else:
-                        logger.warning(f"⚠️ [DRY RUN] Would move to malformed: {update_file.name} - Missing required field: {field}")
-                    return
-
-            # Step 3: Process the update
-            try:
-                self.process_update_file_data(update_file, update_data)
-                # Success - move to processed immediately (but not in dry-run mode)
-                if self.cleanup and not self.dry_run:
-                    self._move_to_processed(update_file)
-            except Exception as e:
-                if self.continue_on_error:
-                    # Don't move files in dry-run mode
-                    if not self.dry_run:
-                        self._move_to_failed(update_file, str(e))
-                else:
-                    raise
+            # Steps 1-2: Parse JSON and validate required fields
+            for pending in self._load_updates(update_file):
+                # Step 3: Process the update
+                self._apply_pending_safely(pending)
 
         except Exception as e:
             error_msg = f"Unexpected error processing {update_file.name}: {str(e)}"
@@ -466,12 +3690,151 @@ class DocumentationUpdateManager:
                 else:
                     logger.warning(f"❌ [DRY RUN] Would move to failed: {update_file.name} - {error_msg}")
             else:
-                self.stats["errors"].append(error_msg)
+                self._record_error(error_msg)
+                raise
+
+    def _apply_pending_safely(self, pending: PendingUpdate) -> None:
+        """Apply a validated update and archive it as processed or failed."""
+        update_file = pending.update_file
+        try:
+            self.process_update_file_data(update_file, pending.update_data, pending.line)
+            if not self.dry_run:
+                self._journal_applied(pending.target_file, [pending] + pending.superseded)
+            # Success - move to processed immediately (but not in dry-run mode)
+            if self.cleanup and not self.dry_run:
+                self._move_to_processed(update_file, pending.line)
+            self._record_latency(pending)
+            if not self.dry_run:
+                self._archive_superseded(pending)
+        except Exception as e:
+            if self.continue_on_error:
+                # Don't move files in dry-run mode
+                if not self.dry_run:
+                    self._move_to_failed(update_file, str(e), pending.line)
+            else:
                 raise
 
-    def process_update_file_data(self, update_file: Path, update_data: Dict) -> None:
+    def _load_updates(self, update_file: Path) -> List[PendingUpdate]:
+        """Parse and validate the updates in a queue file, isolating bad ones.
+
+        A .json file holds one update; a bulk .ndjson file holds one update
+        per line and each line is isolated on its own. Records routed to
+        malformed/ or skipped because the journal shows them applied are
+        left out of the result.
+        """
+        started = time.perf_counter()
+        try:
+            with self.timings.measure("read_update"):
+                raw = update_file.read_bytes()
+        except OSError as e:
+            self._reject_malformed(update_file, f"JSON parse error: {e}")
+            return []
+
+        if update_file.suffix != BULK_SUFFIX:
+            pending = self._load_update(update_file, raw, started)
+            return [pending] if pending is not None else []
+
+        lines = raw.split(b"\n")
+        if lines and not lines[-1]:
+            # Trailing newline after the last record
+            lines.pop()
+        bulk_queue = BulkQueue(update_file, [line.rstrip(b"\r") for line in lines])
+        self._bulk_queues[update_file] = bulk_queue
+        logger.debug(f"📚 {len(lines)} records in bulk queue {update_file.name}")
+
+        pending_updates = []
+        for line, record in enumerate(bulk_queue.lines, 1):
+            if not record.strip():
+                bulk_queue.remove(line)
+                continue
+            pending = self._load_update(update_file, record, started, line)
+            if pending is not None:
+                pending_updates.append(pending)
+        return pending_updates
+
+    def _load_update(
+        self, update_file: Path, raw: bytes, started: float, line: int = 0
+    ) -> Optional[PendingUpdate]:
+        """Parse and validate one update record, isolating it if malformed.
+
+        Returns None if the record was routed to malformed/ or was skipped
+        because the journal shows it was already applied.
+        """
+        # The name is part of the key so a later, identical update still applies
+        key = update_file.name.encode("utf-8") + (f":{line}".encode() if line else b"")
+        digest = hashlib.sha256(key + b"\0" + raw).hexdigest()
+        if self.journal is not None and digest in self.journal:
+            self._skip_journaled(update_file, line)
+            return None
+
+        try:
+            with self.timings.measure("parse"):
+                update_data = _parse_json(raw)
+        except JSON_ERRORS as e:
+            self._reject_malformed(update_file, f"JSON parse error: {e}", line)
+            return None
+
+        with self.timings.measure("validate"):
+            problem = self._validate_update(update_data)
+        if problem:
+            self._reject_malformed(update_file, problem, line)
+            return None
+
+        return PendingUpdate(update_file, update_data, digest, started, line, root=self.root)
+
+    def _validate_update(self, update_data: Any) -> Optional[str]:
+        """Return why an update record is malformed, or None if it is valid."""
+        problems = validate_update_record(update_data, confined=self.confine_targets)
+        return "; ".join(problems) if problems else None
+
+    def _skip_journaled(self, update_file: Path, line: int = 0) -> None:
+        """Skip an update the journal records as applied, archiving it."""
+        logger.info(
+            f"⏭️ Already applied according to journal: {_update_name(update_file, line)}"
+        )
+        with self._stats_lock:
+            self.stats["skipped_journaled"] += 1
+        # It was applied by an earlier run that stopped before archiving it
+        if self.cleanup and not self.dry_run:
+            self._move_to_processed(update_file, line)
+
+    def _journal_applied(
+        self, target_file: Path, applied: List[PendingUpdate]
+    ) -> None:
+        """Record applied updates and the digest of the target they produced."""
+        if self.journal is None:
+            return
+        with self.timings.measure("journal"):
+            target_digest = self._digests.hexdigest(target_file)
+            applied_at = datetime.now().isoformat()
+            self.journal.record(
+                [
+                    {
+                        "update": pending.digest,
+                        "file": pending.name,
+                        "target": str(target_file),
+                        "target_sha256": target_digest,
+                        "applied_at": applied_at,
+                    }
+                    for pending in applied
+                ]
+            )
+
+    def _reject_malformed(self, update_file: Path, error_msg: str, line: int = 0) -> None:
+        """Move a malformed update aside, or only report it in dry-run mode."""
+        # Don't move files in dry-run mode
+        if not self.dry_run:
+            self._move_to_malformed(update_file, error_msg, line)
+        else:
+            logger.warning(
+                f"⚠️ [DRY RUN] Would move to malformed: {_update_name(update_file, line)} - {error_msg}"
+            )
+
+    def process_update_file_data(
+        self, update_file: Path, update_data: Dict, line: int = 0
+    ) -> None:
         """Process update data from a successfully parsed file."""
-        target_file = Path(update_data["file"])
+        target_file = _target_path(update_data, self.root)
         mode = update_data["mode"]
         content = update_data["content"]
         options = update_data.get("options", {})
@@ -480,23 +3843,381 @@ class DocumentationUpdateManager:
 
         if self.dry_run:
             logger.info(f"🧪 [DRY RUN] Would update {target_file}")
-            self.stats["files_processed"] += 1
+            self._record_dry_run()
             return
 
         # Apply the update
-        success = self._apply_update(target_file, mode, content, options)
+        outcome = self._apply_update(target_file, mode, content, options)
 
-        if success:
-            self.stats["files_processed"] += 1
-            self.stats["changes_made"] = True
-            if str(target_file) not in self.stats["files_updated"]:
-                self.stats["files_updated"].append(str(target_file))
+        if outcome == UPDATE_APPLIED:
+            self._record_success(target_file)
+        elif outcome == UPDATE_UNCHANGED:
+            self._record_noop(target_file, update_file, line)
         else:
             raise Exception("Update application failed")
 
     # ...existing code...
+
+
+# Options each synthetic update needs, by mode; n is the update's index
+BENCH_MODES: Dict[str, Callable[[int, int], Dict[str, Any]]] = {
+    "append": lambda n, sections: {},
+    "prepend": lambda n, sections: {},
+    "replace": lambda n, sections: {},
+    "replace-section": lambda n, sections: {"section": f"Section {n % sections}"},
+    "insert-after": lambda n, sections: {"after": f"anchor-{n % sections}"},
+    "insert-before": lambda n, sections: {"before": f"anchor-{n % sections}"},
+    "changelog-entry": lambda n, sections: {},
+    "task-add": lambda n, sections: {},
+    "task-complete": lambda n, sections: {"task_id": f"task-{n:06d}"},
+    "update-badge": lambda n, sections: {"badge_name": f"badge-{n}"},
+}
+
+
+def _bench_document(index: int, size: int, sections: int, tasks: int) -> str:
+    """Build a synthetic markdown document of roughly the requested size."""
+    lines = [
+        f"# Bench document {index}",
+        "",
+        "## [Unreleased]",
+        "",
+        "## [1.0.0]",
+        "",
+        "- Initial release",
+        "",
+    ]
+    filler = "Lorem ipsum dolor sit amet, consectetur adipiscing elit."
+    per_section = max(1, (size // max(1, sections)) // (len(filler) + 1))
+    for section in range(sections):
+        lines += [f"## Section {section}", "", f"anchor-{section}"]
+        lines += [filler] * per_section
+        lines.append("")
+    lines += ["## Tasks", ""]
+    lines += [f"- [ ] task-{task:06d}" for task in range(tasks)]
+    return "\n".join(lines) + "\n"
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    """Return the nearest-rank percentile of values (0 if empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(percentile / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    """Return this process's peak resident set size, if the platform reports it."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_benchmark(argv: List[str]) -> Dict[str, Any]:
+    """Run the update pipeline over a synthetic queue and report its cost."""
+    parser = argparse.ArgumentParser(
+        prog="doc_update_manager.py bench",
+        description="Benchmark process_all_updates on a synthetic update queue",
+    )
+    parser.add_argument("--files", type=int, default=20, help="Updates per target per mode, one replace per target (default: 20)")
+    parser.add_argument("--targets", type=int, default=5, help="Number of target documents (default: 5)")
+    parser.add_argument("--doc-size", type=int, default=64, help="Approximate size of each document in KiB (default: 64)")
+    parser.add_argument("--sections", type=int, default=20, help="Sections per document (default: 20)")
+    parser.add_argument(
+        "--modes",
+        default=",".join(BENCH_MODES),
+        help="Comma-separated update modes to include (default: all)",
+    )
+    parser.add_argument("--batch", action="store_true", help="Benchmark batched mode")
+    parser.add_argument("--jobs", type=int, default=1, help="Worker threads (default: 1)")
+    parser.add_argument("--atomic", action="store_true", help="Benchmark atomic commit mode")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in BENCH_MODES]
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(unknown)}")
+
+    with tempfile.TemporaryDirectory(prefix="doc-update-bench-") as work_dir:
+        work = Path(work_dir)
+        updates_dir = work / "updates"
+        updates_dir.mkdir()
+        document = {}
+        sequence = 0
+        for target in range(args.targets):
+            target_file = work / "docs" / f"doc_{target}.md"
+            target_file.parent.mkdir(exist_ok=True)
+            document[target] = _bench_document(
+                target, args.doc_size * 1024, args.sections, args.files
+            )
+            target_file.write_text(document[target], encoding="utf-8")
+
+        # A replace supersedes every earlier update for its target, so
+        # replaces interleaved with the rest would leave little to apply.
+        # Queue one per target ahead of everything else instead.
+        rounds = [(0, ["replace"])] if "replace" in modes else []
+        rounds += [(n, [mode for mode in modes if mode != "replace"]) for n in range(args.files)]
+        mode_of: Dict[str, str] = {}
+        for n, round_modes in rounds:
+            for target in range(args.targets):
+                for mode in round_modes:
+                    if mode == "replace":
+                        content = document[target] + f"{mode} entry {n}\n"
+                    elif mode == "task-add":
+                        content = f"- [ ] new task {n}"
+                    elif mode == "task-complete":
+                        content = ""
+                    else:
+                        content = f"{mode} entry {n}"
+                    update = {
+                        "file": str(work / "docs" / f"doc_{target}.md"),
+                        "mode": mode,
+                        "content": content,
+                        "options": BENCH_MODES[mode](n, args.sections),
+                    }
+                    sequence += 1
+                    name = f"{sequence:08d}.json"
+                    mode_of[name] = mode
+                    with open(updates_dir / name, "w", encoding="utf-8") as f:
+                        json.dump(update, f)
+
+        manager = DocumentationUpdateManager(
+            updates_dir=str(updates_dir),
+            batch=args.batch,
+            jobs=args.jobs,
+            atomic=args.atomic,
+        )
+        previous_level = logger.level
+        logger.setLevel(logging.WARNING)
+        try:
+            started = time.perf_counter()
+            stats = manager.process_all_updates()
+            elapsed = time.perf_counter() - started
+        finally:
+            logger.setLevel(previous_level)
+
+    # Throughput and latency count applied updates only; superseded ones
+    # were archived without being applied and are reported separately
+    applied = stats["files_processed"]
+    latencies = [latency for _, latency in manager.latencies]
+    superseded_modes = [mode_of[name] for name in stats["superseded_files"]]
+    by_mode = {}
+    for mode in modes:
+        mode_latencies = [latency for m, latency in manager.latencies if m == mode]
+        by_mode[mode] = {
+            "updates": len(mode_latencies),
+            "superseded": superseded_modes.count(mode),
+            "p50_ms": _percentile(mode_latencies, 50) * 1000,
+            "p99_ms": _percentile(mode_latencies, 99) * 1000,
+        }
+
+    report = {
+        "updates": sequence,
+        "targets": args.targets,
+        "doc_size_kib": args.doc_size,
+        "batch": args.batch,
+        "jobs": args.jobs,
+        "atomic": args.atomic,
+        "elapsed_s": elapsed,
+        "applied": applied,
+        "throughput_per_s": applied / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+        "peak_rss_bytes": _peak_rss_bytes(),
+        "bytes_written": stats["bytes_written"],
+        "files_processed": stats["files_processed"],
+        "files_failed": stats["files_failed"],
+        "skipped_noop": stats["skipped_noop"],
+        "skipped_superseded": stats["skipped_superseded"],
+        "modes": by_mode,
+        "stages": stats["stage_timings"],
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        peak = report["peak_rss_bytes"]
+        print("\n⏱️ Benchmark Report:")
+        print(f"   Updates: {sequence} ({args.targets} targets, {args.doc_size} KiB each)")
+        print(f"   Elapsed: {elapsed:.3f}s ({report['throughput_per_s']:.1f} applied updates/s)")
+        print(f"   Latency p50/p99: {report['p50_ms']:.2f}ms / {report['p99_ms']:.2f}ms")
+        print(f"   Peak RSS: {peak / 1048576:.1f} MiB" if peak else "   Peak RSS: n/a")
+        print(f"   Bytes written: {report['bytes_written']}")
+        print(
+            f"   Processed/failed/no-op/superseded: {stats['files_processed']}/"
+            f"{stats['files_failed']}/{stats['skipped_noop']}/{stats['skipped_superseded']}"
+        )
+        for mode, numbers in by_mode.items():
+            print(
+                f"     {mode:<16} {numbers['updates']:>6} applied {numbers['superseded']:>6} superseded"
+                f"  p50 {numbers['p50_ms']:8.2f}ms  p99 {numbers['p99_ms']:8.2f}ms"
+            )
+        print("   Time by stage:")
+        for stage, aggregate in stats["stage_timings"].items():
+            print(
+                f"     {stage:<24} {aggregate['count']:>7} calls {aggregate['total_s'] * 1000:10.2f}ms"
+            )
+    return report
+
+
+# Write slots shared by fan-out worker processes, set by _init_fan_out_worker
+_fan_out_write_slots: Optional[Any] = None
+
+
+def _init_fan_out_worker(write_slots: Any) -> None:
+    global _fan_out_write_slots
+    _fan_out_write_slots = write_slots
+
+
+def _fan_out_repo(
+    root: str, manager_options: Dict[str, Any], queue: List[Path]
+) -> Dict[str, Any]:
+    """Apply the shared update queue to one repository in a worker process.
+
+    Workers always continue past failed updates so that every update is
+    tried in every repository and the queue can be archived per update;
+    otherwise one failure would leave the whole queue, including updates
+    other repositories already applied, to be applied again on the next run.
+    """
+    options = dict(
+        manager_options,
+        root=root,
+        cleanup=False,
+        continue_on_error=True,
+        route_updates=False,
+        write_slots=_fan_out_write_slots,
+        metrics_file=None,
+        compact_after_days=None,
+        retain_days=None,
+    )
+    manager = DocumentationUpdateManager(**options)
+    try:
+        return manager.process_all_updates(queue)
+    except Exception as e:
+        manager._record_error(f"Unexpected error in {root}: {e}")
+        # Whatever was not reached stays queued for every repository
+        manager.stats["backlog_remaining"] = True
+        return manager.stats
+
+
+def _aggregate_stats(per_repo: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine per-repository run statistics into totals."""
+    total = DocumentationUpdateManager._new_stats()
+    for root, stats in per_repo.items():
+        for key, value in stats.items():
+            if key == "stage_timings":
+                for stage, timing in value.items():
+                    merged = total["stage_timings"].setdefault(
+                        stage, {"count": 0, "total_s": 0.0, "max_s": 0.0}
+                    )
+                    merged["count"] += timing["count"]
+                    merged["total_s"] += timing["total_s"]
+                    merged["max_s"] = max(merged["max_s"], timing["max_s"])
+            elif isinstance(value, bool):
+                total[key] = total.get(key, False) or value
+            elif isinstance(value, (int, float)):
+                total[key] = total.get(key, 0) + value
+            elif isinstance(value, list):
+                # Updated files already carry the root; name it for the others
+                total.setdefault(key, []).extend(
+                    value if key == "files_updated" else [f"{root}: {item}" for item in value]
+                )
+    return total
+
+
+def _read_repo_manifest(manifest: Path) -> List[str]:
+    """Read repository roots, one per line; relative ones are under the manifest's directory."""
+    roots = []
+    for line in manifest.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            roots.append(str(manifest.parent / line))
+    return roots
+
+
+def run_fan_out(
+    repos: List[str],
+    manager_options: Dict[str, Any],
+    workers: Optional[int] = None,
+    max_writers: int = 4,
+) -> Dict[str, Any]:
+    """Apply one update queue to many repository checkouts on a process pool.
+
+    Each repository gets its own manager in a worker process, with update
+    `file` paths resolved against the repository root. Workers leave the
+    queue in place, and at most max_writers of them write a document at any
+    moment. Once every repository is done the queue is archived here, with
+    updates that failed anywhere going to failed/.
+
+    Update `file` values that are absolute or lead out of the root are
+    malformed in this mode, and a repository listed more than once is only
+    processed once.
+
+    Returns {"repos": {root: stats}, "aggregate": stats}.
+    """
+    unique_repos: Dict[Path, str] = {}
+    for root in repos:
+        resolved = Path(root).resolve()
+        if resolved in unique_repos:
+            logger.warning(f"⚠️ Skipping {root}: same repository as {unique_repos[resolved]}")
+            continue
+        unique_repos[resolved] = root
+    repos = list(unique_repos.values())
+
+    manager_options = dict(manager_options, confine_targets=True)
+    manager = DocumentationUpdateManager(**manager_options)
+    queue = manager._discover_updates(None, sys.maxsize)
+    logger.info(
+        f"🌐 Applying {len(queue)} update files to {len(repos)} repositories "
+        f"({workers or os.cpu_count()} workers, {max_writers} writers)"
+    )
+
+    write_slots = multiprocessing.Semaphore(max(1, max_writers))
+    per_repo: Dict[str, Dict[str, Any]] = {}
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_fan_out_worker, initargs=(write_slots,)
+    ) as executor:
+        futures = [
+            executor.submit(_fan_out_repo, root, manager_options, queue) for root in repos
+        ]
+        for root, future in zip(repos, futures):
+            try:
+                per_repo[root] = future.result()
+            except Exception as e:
+                stats = DocumentationUpdateManager._new_stats()
+                stats["errors"].append(f"Worker for {root} failed: {e}")
+                stats["backlog_remaining"] = True
+                per_repo[root] = stats
+            stats = per_repo[root]
+            logger.info(
+                f"   {root}: {stats['files_processed']} processed, "
+                f"{stats['files_failed']} failed, {stats['files_malformed']} malformed, "
+                f"{len(stats['errors'])} errors"
+            )
+
+    if not manager.dry_run:
+        manager._archive_fan_out(queue, per_repo)
+        manager._maintain_archive()
+
+    aggregate = _aggregate_stats(per_repo)
+    manager.stats = dict(aggregate, repos=per_repo)
+    manager._save_stats()
+    return {"repos": per_repo, "aggregate": aggregate}
+
+
 def main():
     """Main entry point."""
+    # Subcommand kept outside the main parser so the positional directory
+    # argument stays backwards compatible
+    if sys.argv[1:2] == ["bench"]:
+        run_benchmark(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         description="Process documentation update files",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -507,6 +4228,23 @@ Examples:
   python doc_update_manager.py --dry-run --verbose
   python doc_update_manager.py --no-cleanup
   python doc_update_manager.py --ignore-errors
+  python doc_update_manager.py --batch
+  python doc_update_manager.py --batch --jobs 8
+  python doc_update_manager.py --atomic
+  python doc_update_manager.py --journal --cleanup false
+  python doc_update_manager.py bench --targets 10 --doc-size 512 --batch
+  python doc_update_manager.py --metrics-file /var/lib/node_exporter/doc_updates.prom \\
+      --metrics-format prometheus
+  python doc_update_manager.py --watch --debounce 2
+  python doc_update_manager.py --cache-size 256
+  python doc_update_manager.py --compact-after 7 --retain-days 90
+  python doc_update_manager.py --max-files 5000 --time-budget 300
+  python doc_update_manager.py --pipeline --jobs 4
+  python doc_update_manager.py --diff
+  python doc_update_manager.py --patch /tmp/doc-updates.patch
+  python doc_update_manager.py --mmap-threshold 16
+  python doc_update_manager.py --repo ../module-a --repo ../module-b
+  python doc_update_manager.py --repos-file repos.txt --repo-workers 8 --max-writers 4
         """,
     )
 
@@ -536,6 +4274,172 @@ Examples:
         help="Continue processing even if some updates fail",
     )
 
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker threads for independent target files (default: 1)",
+    )
+
+    parser.add_argument(
+        "--atomic",
+        action="store_true",
+        help="Stage all documents, fsync them together and rename them into "
+        "place before archiving any update (implies --batch)",
+    )
+
+    parser.add_argument(
+        "--journal",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help="Record applied updates in a JSONL journal and skip them on later "
+        "runs (default path: <updates-dir>/journal.jsonl)",
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        metavar="PATH",
+        help="Export run statistics and per-stage timings to PATH; keep it "
+        "outside the repository to avoid merge conflicts",
+    )
+
+    parser.add_argument(
+        "--metrics-format",
+        choices=["json", "prometheus"],
+        default="json",
+        help="Format for --metrics-file (default: json)",
+    )
+
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and process updates as they arrive (implies --batch and --ignore-errors)",
+    )
+
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.5,
+        metavar="SECONDS",
+        help="In watch mode, wait for this much quiet before processing a burst "
+        "(default: 0.5)",
+    )
+
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="In watch mode, directory polling interval when inotify is "
+        "unavailable (default: 1.0)",
+    )
+
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=64,
+        metavar="MB",
+        help="Memory limit for cached target documents in MiB, 0 to disable "
+        "(default: 64)",
+    )
+
+    parser.add_argument(
+        "--compact-after",
+        type=int,
+        metavar="DAYS",
+        help="Pack archived day shards older than DAYS into tar.gz segments",
+    )
+
+    parser.add_argument(
+        "--retain-days",
+        type=int,
+        metavar="DAYS",
+        help="Delete archived updates and error logs older than DAYS",
+    )
+
+    parser.add_argument(
+        "--max-files",
+        type=int,
+        metavar="N",
+        help="Process at most N queue files this run, oldest first",
+    )
+
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        metavar="SECONDS",
+        help="Stop starting new updates after SECONDS; the rest stay queued",
+    )
+
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Overlap reading, applying and writing updates in a staged "
+        "asyncio pipeline (use --jobs to size its thread pool)",
+    )
+
+    parser.add_argument(
+        "--diff",
+        dest="diff_output",
+        action="store_const",
+        const="-",
+        help="Dry run that prints a unified diff of every target to stdout",
+    )
+
+    parser.add_argument(
+        "--patch",
+        dest="diff_output",
+        metavar="FILE",
+        help="Dry run that writes one combined patch for all targets to FILE",
+    )
+
+    parser.add_argument(
+        "--mmap-threshold",
+        type=int,
+        default=32,
+        metavar="MB",
+        help="Edit targets of at least MB MiB through a memory map when "
+        "inserting, replacing a section or adding a changelog entry, "
+        "0 to disable (default: 32)",
+    )
+
+    parser.add_argument(
+        "--repo",
+        action="append",
+        metavar="ROOT",
+        help="Apply the queue to this repository checkout, resolving each "
+        "update's file against ROOT (repeatable)",
+    )
+
+    parser.add_argument(
+        "--repos-file",
+        metavar="FILE",
+        help="Read repository roots for --repo from FILE, one per line",
+    )
+
+    parser.add_argument(
+        "--repo-workers",
+        type=int,
+        metavar="N",
+        help="Worker processes for --repo/--repos-file (default: CPU count)",
+    )
+
+    parser.add_argument(
+        "--max-writers",
+        type=int,
+        default=4,
+        metavar="N",
+        help="Repositories writing documents at the same time (default: 4)",
+    )
+
+    parser.add_argument(
+        "--batch",
+        action="store_true",
+        help="Apply all updates for each target in memory and write it once",
+    )
+
     # Support positional argument for backwards compatibility
     parser.add_argument(
         "updates_directory",
@@ -548,22 +4452,75 @@ Examples:
     # Use positional argument if provided
     updates_dir = args.updates_directory or args.updates_dir
 
-    manager = DocumentationUpdateManager(
+    repos = list(args.repo or [])
+    if args.repos_file:
+        repos += _read_repo_manifest(Path(args.repos_file))
+    if args.watch and not args.cleanup:
+        # Processed files would stay queued and be applied again on every run
+        if args.journal is None:
+            parser.error("--watch --cleanup false requires --journal")
+        for flag, value in (
+            ("--max-files", args.max_files is not None),
+            ("--time-budget", args.time_budget is not None),
+        ):
+            if value:
+                parser.error(f"{flag} cannot be combined with --watch --cleanup false")
+
+    if repos:
+        # Each of these would need one shared view of the queue across repos
+        for flag, value in (
+            ("--watch", args.watch),
+            ("--journal", args.journal is not None),
+            ("--max-files", args.max_files is not None),
+            ("--time-budget", args.time_budget is not None),
+            ("--diff/--patch", args.diff_output is not None),
+        ):
+            if value:
+                parser.error(f"{flag} cannot be combined with --repo/--repos-file")
+
+    manager_options = dict(
         updates_dir=updates_dir,
         cleanup=args.cleanup,
-        dry_run=args.dry_run,
+        dry_run=args.dry_run or args.diff_output is not None,
         verbose=args.verbose,
         continue_on_error=args.ignore_errors,
+        batch=args.batch,
+        jobs=args.jobs,
+        atomic=args.atomic,
+        journal=args.journal,
+        metrics_file=args.metrics_file,
+        metrics_format=args.metrics_format,
+        document_cache_bytes=args.cache_size * 1024 * 1024,
+        compact_after_days=args.compact_after,
+        retain_days=args.retain_days,
+        max_files=args.max_files,
+        time_budget=args.time_budget,
+        pipeline=args.pipeline,
+        diff_output=args.diff_output,
+        mmap_threshold_bytes=args.mmap_threshold * 1024 * 1024,
     )
 
     try:
-        stats = manager.process_all_updates()
+        if repos:
+            report = run_fan_out(repos, manager_options, args.repo_workers, args.max_writers)
+            stats = report["aggregate"]
+        else:
+            manager = DocumentationUpdateManager(**manager_options)
+            if args.watch:
+                manager.watch(debounce=args.debounce, poll_interval=args.poll_interval)
+                return
+
+            stats = manager.process_all_updates()
 
         if args.verbose or args.dry_run:
             print("\n📊 Processing Summary:")
             print(f"   Files processed: {stats['files_processed']}")
             print(f"   Files malformed: {stats['files_malformed']}")
             print(f"   Files failed: {stats['files_failed']}")
+            print(f"   Files skipped (no-op): {stats['skipped_noop']}")
+            if args.journal is not None:
+                print(f"   Files skipped (journal): {stats['skipped_journaled']}")
+            print(f"   Files skipped (superseded): {stats['skipped_superseded']}")
             print(f"   Changes made: {stats['changes_made']}")
             print(f"   Files updated: {len(stats['files_updated'])}")
             if stats["errors"]:
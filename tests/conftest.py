@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# file: tests/conftest.py
+# version: 1.0.0
+# guid: 41f2d534-181b-4a69-a585-3d9d7000fc89
+
+"""Shared fixtures for the doc_update_manager tests."""
+
+import json
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+@pytest.fixture
+def queue_updates() -> Callable[[Path, List[Dict[str, Any]]], None]:
+    """Return a helper writing updates as numbered .json files into a queue."""
+
+    def write(updates_dir: Path, updates: List[Dict[str, Any]]) -> None:
+        updates_dir.mkdir(parents=True, exist_ok=True)
+        for number, update in enumerate(updates, 1):
+            path = updates_dir / f"{number:04d}.json"
+            path.write_text(json.dumps(update), encoding="utf-8")
+
+    return write
+
+
+def archived_names(updates_dir: Path) -> Dict[str, List[str]]:
+    """Map each archive category to the sorted update names it holds.
+
+    Date shards, time prefixes and the superseded marker are dropped, so
+    runs made at different moments or by different modes compare equal.
+    """
+    names: Dict[str, List[str]] = {}
+    for category in ("processed", "failed", "malformed"):
+        category_dir = updates_dir / category
+        found = []
+        if category_dir.exists():
+            for path in category_dir.rglob("*"):
+                if path.is_file():
+                    name = path.name.split("_", 1)[1] if "_" in path.name else path.name
+                    found.append(name.replace(".superseded", ""))
+        names[category] = sorted(found)
+    names["queued"] = sorted(
+        path.name for path in updates_dir.glob("*") if path.suffix in (".json", ".ndjson")
+    )
+    return names
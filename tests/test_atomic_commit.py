@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# file: tests/test_atomic_commit.py
+# version: 1.0.0
+# guid: c719bde8-3348-499b-8e49-764ee1a1e006
+
+"""Tests for the --atomic two-phase commit of staged documents."""
+
+import os
+from pathlib import Path
+
+import pytest
+from conftest import archived_names
+
+from doc_update_manager import DocumentationUpdateManager
+
+
+@pytest.fixture
+def three_targets(tmp_path, queue_updates):
+    """Queue one append for each of three targets; return their paths."""
+    targets = [tmp_path / f"{name}.md" for name in "ABC"]
+    for target in targets:
+        target.write_text("start", encoding="utf-8")
+    queue_updates(
+        tmp_path / "updates",
+        [{"file": str(target), "mode": "append", "content": "new"} for target in targets],
+    )
+    return targets
+
+
+def _fail_replace_onto(monkeypatch, failing: Path) -> None:
+    """Make renames onto one path fail, as on a full or read-only disk."""
+    real_replace = os.replace
+
+    def replace(src, dst):
+        if Path(dst) == failing:
+            raise OSError("simulated rename failure")
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", replace)
+
+
+def _temp_files(directory: Path):
+    return sorted(path.name for path in directory.glob(".*.tmp"))
+
+
+def test_rename_failure_still_archives_renamed_targets(tmp_path, three_targets, monkeypatch):
+    """Targets renamed before a failing one keep their updates archived."""
+    a, b, c = three_targets
+    _fail_replace_onto(monkeypatch, b)
+    manager = DocumentationUpdateManager(
+        updates_dir=str(tmp_path / "updates"), atomic=True, continue_on_error=False
+    )
+
+    with pytest.raises(Exception):
+        manager.process_all_updates()
+
+    assert a.read_text(encoding="utf-8") == "start\nnew"
+    assert b.read_text(encoding="utf-8") == "start"
+    assert c.read_text(encoding="utf-8") == "start\nnew"
+    archive = archived_names(tmp_path / "updates")
+    assert archive["processed"] == ["0001.json", "0003.json"]
+    # Stopping on errors leaves the failed update queued for the next run
+    assert archive["queued"] == ["0002.json"]
+    assert _temp_files(tmp_path) == []
+
+
+def test_rename_failure_routes_only_its_target_to_failed(tmp_path, three_targets, monkeypatch):
+    """When continuing on errors, only the target that failed is routed to failed/."""
+    _, b, _ = three_targets
+    _fail_replace_onto(monkeypatch, b)
+    manager = DocumentationUpdateManager(updates_dir=str(tmp_path / "updates"), atomic=True)
+
+    stats = manager.process_all_updates()
+
+    assert stats["files_processed"] == 2
+    assert stats["files_failed"] == 1
+    archive = archived_names(tmp_path / "updates")
+    assert archive["processed"] == ["0001.json", "0003.json"]
+    assert archive["failed"] == ["0002.json"]
+    assert _temp_files(tmp_path) == []
+
+
+def test_staging_failure_removes_staged_files_and_writes_nothing(
+    tmp_path, three_targets, monkeypatch
+):
+    """A failure while staging stops the commit before any target is replaced."""
+    a, b, c = three_targets
+    real_stage = DocumentationUpdateManager._stage_target
+
+    def stage(self, target_file, content):
+        if target_file == b:
+            raise OSError("simulated staging failure")
+        return real_stage(self, target_file, content)
+
+    monkeypatch.setattr(DocumentationUpdateManager, "_stage_target", stage)
+    manager = DocumentationUpdateManager(
+        updates_dir=str(tmp_path / "updates"), atomic=True, continue_on_error=False
+    )
+
+    with pytest.raises(Exception):
+        manager.process_all_updates()
+
+    for target in (a, b, c):
+        assert target.read_text(encoding="utf-8") == "start"
+    assert archived_names(tmp_path / "updates")["queued"] == ["0001.json", "0002.json", "0003.json"]
+    assert _temp_files(tmp_path) == []
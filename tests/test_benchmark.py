@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# file: tests/test_benchmark.py
+# version: 1.0.0
+# guid: 0ec01192-fd4b-4668-89b8-79a75a2eb750
+
+"""Tests for the `bench` subcommand's report."""
+
+import json
+
+import pytest
+
+from doc_update_manager import run_benchmark
+
+
+@pytest.mark.parametrize(
+    "flags", [[], ["--batch"], ["--atomic"]], ids=["serial", "batch", "atomic"]
+)
+def test_report_accounts_for_every_queued_update(capsys, flags):
+    """Every queued update is either applied or reported as superseded."""
+    report = run_benchmark(["--files", "2", "--targets", "2", "--doc-size", "4", "--json", *flags])
+
+    assert json.loads(capsys.readouterr().out)["updates"] == report["updates"]
+    assert report["files_failed"] == 0
+    assert report["applied"] + report["skipped_superseded"] == report["updates"]
+    per_mode = report["modes"].values()
+    assert sum(mode["updates"] + mode["superseded"] for mode in per_mode) == report["updates"]
+    # Appends are written in place unless the run writes each target once
+    assert ("write_in_place" in report["stages"]) == (not flags)
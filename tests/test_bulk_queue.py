@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# file: tests/test_bulk_queue.py
+# version: 1.1.1
+# guid: 1dc2db67-4d19-4f49-94b0-3bef11278ad6
+
+"""Regression tests for bulk .ndjson queue files."""
+
+import json
+from pathlib import Path
+
+from doc_update_manager import DocumentationUpdateManager
+
+
+def _append(target: Path, content: str) -> bytes:
+    return json.dumps({"file": str(target), "mode": "append", "content": content}).encode()
+
+
+def test_rerun_skips_bulk_records_after_a_malformed_line(tmp_path):
+    """A dequeued malformed line must not renumber the records after it."""
+    updates_dir = tmp_path / "updates"
+    updates_dir.mkdir()
+    target = tmp_path / "T.md"
+    target.write_text("start", encoding="utf-8")
+    bulk_file = updates_dir / "0001.ndjson"
+    bulk_file.write_bytes(
+        b"\n".join([_append(target, "one"), b"{not json", _append(target, "three")]) + b"\n"
+    )
+
+    for _ in range(2):
+        manager = DocumentationUpdateManager(
+            updates_dir=str(updates_dir),
+            cleanup=False,
+            continue_on_error=True,
+            journal="",
+        )
+        stats = manager.process_all_updates()
+
+    assert target.read_text(encoding="utf-8") == "start\none\nthree"
+    assert stats["skipped_journaled"] == 2
+    assert stats["files_processed"] == 0
+
+
+def test_archived_bulk_file_leaves_out_split_records(tmp_path):
+    """Records split out to malformed/ and failed/ are not archived again."""
+    updates_dir = tmp_path / "updates"
+    updates_dir.mkdir()
+    target = tmp_path / "T.md"
+    target.write_text("start", encoding="utf-8")
+    complete_missing = json.dumps(
+        {
+            "file": str(target),
+            "mode": "task-complete",
+            "content": "",
+            "options": {"task_id": "missing"},
+        }
+    ).encode()
+    (updates_dir / "0001.ndjson").write_bytes(
+        b"\n".join(
+            [_append(target, "one"), b"{not json", complete_missing, _append(target, "four")]
+        )
+        + b"\n"
+    )
+
+    manager = DocumentationUpdateManager(updates_dir=str(updates_dir), continue_on_error=True)
+    stats = manager.process_all_updates()
+
+    assert stats["files_processed"] == 2
+    assert stats["files_malformed"] == 1
+    assert stats["files_failed"] == 1
+    assert not (updates_dir / "0001.ndjson").exists()
+    (archived,) = (updates_dir / "processed").rglob("*0001.ndjson")
+    assert archived.read_bytes() == (
+        _append(target, "one") + b"\n\n\n" + _append(target, "four") + b"\n"
+    )
+    (malformed,) = (updates_dir / "malformed").rglob("*.ndjson")
+    assert malformed.read_bytes() == b"{not json\n"
+    (failed,) = (updates_dir / "failed").rglob("*.ndjson")
+    assert failed.read_bytes() == complete_missing + b"\n"
+
+
+def test_bulk_file_with_only_split_records_is_not_archived_as_processed(tmp_path):
+    """A bulk file whose records all went elsewhere leaves nothing in processed/."""
+    updates_dir = tmp_path / "updates"
+    updates_dir.mkdir()
+    (updates_dir / "0001.ndjson").write_bytes(b"{not json\n[]\n")
+
+    manager = DocumentationUpdateManager(updates_dir=str(updates_dir), continue_on_error=True)
+    stats = manager.process_all_updates()
+
+    assert stats["files_malformed"] == 2
+    assert not (updates_dir / "0001.ndjson").exists()
+    assert not list((updates_dir / "processed").rglob("*.ndjson"))
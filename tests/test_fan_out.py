@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# file: tests/test_fan_out.py
+# version: 1.0.0
+# guid: eb9d3178-8ed7-49ee-a1fa-0ef39cf01d53
+
+"""Tests for applying one shared update queue to several repositories."""
+
+import pytest
+from conftest import archived_names
+
+from doc_update_manager import run_fan_out
+
+
+@pytest.fixture
+def repos(tmp_path):
+    """Two repository checkouts; only the first has task t1."""
+    first, second = tmp_path / "r1", tmp_path / "r2"
+    first.mkdir()
+    second.mkdir()
+    (first / "T.md").write_text("# T\n\n- [ ] t1\n", encoding="utf-8")
+    (second / "T.md").write_text("# T\n", encoding="utf-8")
+    return first, second
+
+
+def _fan_out(tmp_path, roots):
+    return run_fan_out(
+        [str(root) for root in roots],
+        {"updates_dir": str(tmp_path / "updates"), "continue_on_error": False},
+        workers=2,
+    )
+
+
+def test_failure_in_one_repository_archives_the_queue_per_update(
+    tmp_path, repos, queue_updates
+):
+    """An update failing in one repository does not requeue the others' work."""
+    first, second = repos
+    queue_updates(
+        tmp_path / "updates",
+        [
+            {"file": "T.md", "mode": "append", "content": "one"},
+            {"file": "T.md", "mode": "task-complete", "content": "", "options": {"task_id": "t1"}},
+        ],
+    )
+
+    report = _fan_out(tmp_path, repos)
+    # Nothing is left queued, so a rerun applies nothing a second time
+    _fan_out(tmp_path, repos)
+
+    assert first.joinpath("T.md").read_text(encoding="utf-8") == "# T\n\n- [x] t1\n\none"
+    assert second.joinpath("T.md").read_text(encoding="utf-8") == "# T\n\none"
+    archive = archived_names(tmp_path / "updates")
+    assert archive["processed"] == ["0001.json"]
+    assert archive["failed"] == ["0002.json"]
+    assert archive["queued"] == []
+    assert report["repos"][str(second)]["files_failed"] == 1
+    assert report["aggregate"]["errors"]
+
+
+def test_targets_outside_the_repository_are_malformed(tmp_path, repos, queue_updates):
+    """Absolute and root-escaping targets are rejected before any write."""
+    outside = tmp_path / "outside.md"
+    queue_updates(
+        tmp_path / "updates",
+        [
+            {"file": str(outside), "mode": "append", "content": "absolute"},
+            {"file": "../outside.md", "mode": "append", "content": "escaping"},
+            {"file": "docs/../T.md", "mode": "append", "content": "inside"},
+        ],
+    )
+
+    _fan_out(tmp_path, repos)
+
+    assert not outside.exists()
+    for root in repos:
+        assert root.joinpath("T.md").read_text(encoding="utf-8").endswith("\ninside")
+    archive = archived_names(tmp_path / "updates")
+    assert archive["malformed"] == ["0001.json", "0002.json"]
+    assert archive["processed"] == ["0003.json"]
+
+
+def test_repository_listed_twice_is_processed_once(tmp_path, repos, queue_updates):
+    """Different spellings of one checkout do not apply the queue twice."""
+    first, _ = repos
+    queue_updates(tmp_path / "updates", [{"file": "T.md", "mode": "append", "content": "one"}])
+
+    report = _fan_out(tmp_path, [first, tmp_path / "r2" / ".." / "r1"])
+
+    assert first.joinpath("T.md").read_text(encoding="utf-8") == "# T\n\n- [ ] t1\n\none"
+    assert list(report["repos"]) == [str(first)]
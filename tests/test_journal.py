@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# file: tests/test_journal.py
+# version: 1.0.0
+# guid: 04c70793-c0b5-4996-929f-8326cecbd8b2
+
+"""Tests for the --journal record of applied updates and its pruning."""
+
+import hashlib
+import json
+
+import pytest
+from conftest import archived_names
+
+from doc_update_manager import DocumentationUpdateManager, UpdateJournal
+
+UPDATES = [
+    {"mode": "append", "content": "one é"},
+    {"mode": "changelog-entry", "content": "- entry"},
+    {"mode": "append", "content": "two"},
+]
+
+
+def _entries(journal_file):
+    with open(journal_file, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def kept_queue(tmp_path, queue_updates):
+    """Queue UPDATES for one target; return the target and the updates directory."""
+    target = tmp_path / "T.md"
+    target.write_text("# T\n\n## [Unreleased]\n\n- old\n", encoding="utf-8")
+    queue_updates(tmp_path / "updates", [dict(update, file=str(target)) for update in UPDATES])
+    return target, tmp_path / "updates"
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"batch": True}, {"pipeline": True}, {"mmap_threshold_bytes": 1}],
+    ids=["serial", "batch", "pipeline", "mmap"],
+)
+def test_journal_records_the_digest_of_the_written_target(kept_queue, options):
+    """Each entry names its update, and the last one the target as it ended up."""
+    target, updates_dir = kept_queue
+    manager = DocumentationUpdateManager(
+        updates_dir=str(updates_dir), cleanup=False, journal="", **options
+    )
+
+    manager.process_all_updates()
+
+    entries = _entries(updates_dir / "journal.jsonl")
+    assert sorted(entry["file"] for entry in entries) == ["0001.json", "0002.json", "0003.json"]
+    assert {entry["target"] for entry in entries} == {str(target)}
+    assert entries[-1]["target_sha256"] == hashlib.sha256(target.read_bytes()).hexdigest()
+
+
+def test_rerun_skips_journaled_updates(kept_queue):
+    """Kept update files are not applied a second time by a later run."""
+    target, updates_dir = kept_queue
+    DocumentationUpdateManager(
+        updates_dir=str(updates_dir), cleanup=False, journal=""
+    ).process_all_updates()
+    first = target.read_bytes()
+
+    manager = DocumentationUpdateManager(updates_dir=str(updates_dir), cleanup=False, journal="")
+    stats = manager.process_all_updates()
+
+    assert target.read_bytes() == first
+    assert stats["skipped_journaled"] == len(UPDATES)
+    assert stats["files_processed"] == 0
+    assert len(_entries(updates_dir / "journal.jsonl")) == len(UPDATES)
+
+
+def test_entries_are_pruned_once_their_updates_are_archived(kept_queue):
+    """A run that archives journaled updates drops their entries."""
+    target, updates_dir = kept_queue
+    DocumentationUpdateManager(
+        updates_dir=str(updates_dir), cleanup=False, journal=""
+    ).process_all_updates()
+    first = target.read_bytes()
+    (updates_dir / "0003.json").unlink()
+
+    stats = DocumentationUpdateManager(
+        updates_dir=str(updates_dir), journal=""
+    ).process_all_updates()
+
+    assert target.read_bytes() == first
+    assert stats["skipped_journaled"] == 2
+    assert archived_names(updates_dir)["processed"] == ["0001.json", "0002.json"]
+    assert _entries(updates_dir / "journal.jsonl") == []
+
+
+def test_torn_lines_are_ignored_and_pruned(tmp_path):
+    """A line cut short by an interrupted run neither breaks loading nor survives pruning."""
+    journal_file = tmp_path / "journal.jsonl"
+    journal_file.write_text(
+        '{"update": "a", "file": "1.json"}\n{"update": "b", "fi', encoding="utf-8"
+    )
+
+    journal = UpdateJournal(journal_file)
+
+    assert "a" in journal
+    assert "b" not in journal
+    assert journal.prune(lambda entry: True) == 1
+    assert _entries(journal_file) == [{"update": "a", "file": "1.json"}]
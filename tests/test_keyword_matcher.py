@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# file: tests/test_keyword_matcher.py
+# version: 1.0.0
+# guid: 2713eea8-f43f-47f4-a686-28eb9181cbeb
+
+"""Tests for the Aho-Corasick KeywordMatcher used to complete tasks in one pass."""
+
+import random
+
+import pytest
+
+from doc_update_manager import KeywordMatcher
+
+
+def _naive(keys, text, start=0, end=None):
+    window = text[start:end]
+    return {index for index, key in enumerate(keys) if key in window}
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_search_agrees_with_substring_checks(seed):
+    """Every key found by `in` is reported, and nothing else."""
+    rng = random.Random(seed)
+    # A small alphabet makes overlapping and nested keys common
+    alphabet = "abc-[] x"
+    keys = [
+        "".join(rng.choices(alphabet, k=rng.randint(0, 5))) for _ in range(rng.randint(1, 12))
+    ]
+    matcher = KeywordMatcher(keys)
+
+    for _ in range(20):
+        text = "".join(rng.choices(alphabet, k=rng.randint(0, 60)))
+        start = rng.randint(0, len(text))
+        end = rng.choice([None, rng.randint(start, len(text))])
+        assert matcher.search(text, start, end) == _naive(keys, text, start, end)
+
+
+def test_search_reports_overlapping_and_repeated_keys():
+    """Keys that are suffixes or prefixes of each other are all reported."""
+    keys = ["she", "he", "hers", "his", "he", "task-1", "task-10"]
+    matcher = KeywordMatcher(keys)
+
+    assert matcher.search("ushers") == {0, 1, 2, 4}
+    assert matcher.search("- [ ] task-10") == {5, 6}
+    assert matcher.search("- [ ] task-1\n") == {5}
+    assert matcher.search("nothing here") == {1, 4}
+
+
+def test_empty_key_occurs_everywhere():
+    """An empty key matches every text, even an empty one."""
+    matcher = KeywordMatcher(["", "a"])
+
+    assert matcher.search("") == {0}
+    assert matcher.search("bab") == {0, 1}
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# file: tests/test_mapped_target.py
+# version: 1.0.0
+# guid: 38963e9e-0ee1-415f-8a26-fcf467729d18
+
+"""The memory-mapped splice must write the same bytes as the in-memory edit."""
+
+import pytest
+
+from doc_update_manager import DocumentationUpdateManager
+
+BODY = (
+    "# Café\n\n## [Unreleased]\n\n- old\n\n## [1.0.0]\n\n- r\n\n"
+    "## Notes é\n\nanchor é here\nanchor again\n\n## End\n\ntail\n"
+)
+
+UPDATES = [
+    {"mode": "insert-after", "content": "after é", "options": {"after": "anchor"}},
+    {"mode": "insert-before", "content": "before", "options": {"before": "tail"}},
+    {"mode": "replace-section", "content": "new é", "options": {"section": "Notes é"}},
+    {"mode": "changelog-entry", "content": "- entry é"},
+    {"mode": "replace-section", "content": "added", "options": {"section": "Missing"}},
+]
+
+
+def _run(work, body: bytes, queue_updates, threshold: int):
+    """Apply UPDATES to a target holding `body`; return its bytes and stage counts."""
+    target = work / "T.md"
+    work.mkdir()
+    target.write_bytes(body)
+    queue_updates(work / "updates", [dict(update, file=str(target)) for update in UPDATES])
+    manager = DocumentationUpdateManager(
+        updates_dir=str(work / "updates"), mmap_threshold_bytes=threshold
+    )
+    stats = manager.process_all_updates()
+    assert stats["files_processed"] == len(UPDATES)
+    counts = {stage: timing["count"] for stage, timing in stats["stage_timings"].items()}
+    return target.read_bytes(), counts
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "latin-1"])
+def test_mapped_splice_matches_in_memory_edit(tmp_path, queue_updates, encoding):
+    """Every update is spliced through the map, and the result is byte-identical."""
+    body = BODY.encode(encoding)
+
+    mapped, counts = _run(tmp_path / "mapped", body, queue_updates, threshold=1)
+    in_memory, _ = _run(tmp_path / "in-memory", body, queue_updates, threshold=0)
+
+    assert mapped == in_memory
+    # One rename per update shows the splice path ran rather than the fallback
+    assert counts["rename"] == len(UPDATES)
+
+
+def test_carriage_returns_fall_back_to_in_memory_edit(tmp_path, queue_updates):
+    """CRLF targets are edited in memory, with the same result as without mmap."""
+    body = BODY.replace("\n", "\r\n").encode("utf-8")
+
+    mapped, counts = _run(tmp_path / "mapped", body, queue_updates, threshold=1)
+    in_memory, _ = _run(tmp_path / "in-memory", body, queue_updates, threshold=0)
+
+    assert mapped == in_memory
+    assert b"\r" not in mapped
+    # At least the first edit is made on the decoded text, which normalizes
+    # the line endings; later updates may then be spliced
+    assert counts["read"] >= 1
+    assert counts.get("rename", 0) < len(UPDATES)
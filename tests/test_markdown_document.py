@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# file: tests/test_markdown_document.py
+# version: 1.0.0
+# guid: f76553b1-4ed4-4b4a-af5d-20ca9b99d2ff
+
+"""Tests for the MarkdownDocument piece table and its incremental index."""
+
+import random
+
+import pytest
+
+from doc_update_manager import MarkdownDocument, PatternCache
+
+# Fragments random edits are built from; they make and break heading and
+# task lines, including across existing line boundaries
+FRAGMENTS = [
+    "",
+    "\n",
+    "text",
+    "# Title\n",
+    "## [Unreleased]\n",
+    "## [1.2.0]\n",
+    "### Sub\n",
+    "- [ ] task\n",
+    "- [x] done\n",
+    "\n## Notes",
+    "#",
+    " [ ] ",
+    "- [",
+    "é\n",
+]
+
+BASE = (
+    "# Project\n\n## [Unreleased]\n\n- entry\n\n## [1.0.0]\n\n- first\n\n"
+    "## Tasks\n\n- [ ] one\n- [x] two\n  - [ ] nested\n\n## Notes\n\nbody\n"
+)
+
+
+def _titles(text: str):
+    """Heading titles in text, as a fresh scan finds them, plus a missing one."""
+    patterns = PatternCache()
+    found = patterns.get("index").finditer(text)
+    return {match.group(2) or "" for match in found if match.group(1)} | {"Missing"}
+
+
+def _index(document: MarkdownDocument, titles):
+    """Everything a caller can observe of a document's index."""
+    return (
+        {title: document.find_section(title) for title in titles},
+        document.changelog_offsets(),
+        document.open_task_offsets(),
+        document.done_task_offsets(),
+    )
+
+
+def _random_edits(rng: random.Random, length: int):
+    """Sorted, non-overlapping (start, end, text) edits within length."""
+    points = sorted(rng.sample(range(length + 1), k=min(length + 1, 2 * rng.randint(1, 3))))
+    edits = []
+    for start, end in zip(points[::2], points[1::2]):
+        if rng.random() < 0.5:
+            # Mostly small replacements, as the update modes make
+            end = min(end, start + rng.randint(0, 12))
+        edits.append((start, end, "".join(rng.choices(FRAGMENTS, k=rng.randint(0, 3)))))
+    return edits
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_reindex_matches_a_fresh_scan_after_random_splices(seed):
+    """The incrementally maintained index equals a full rescan of the text."""
+    rng = random.Random(seed)
+    patterns = PatternCache()
+    document = MarkdownDocument(BASE, patterns)
+    expected = BASE
+    # Build the index first, so later edits go through _reindex
+    document.find_section("Tasks")
+
+    for _ in range(25):
+        edits = _random_edits(rng, len(expected))
+        for start, end, new_text in reversed(edits):
+            expected = expected[:start] + new_text + expected[end:]
+        if len(edits) == 1:
+            document.splice(*edits[0])
+        else:
+            document.splice_many(edits)
+
+        assert len(document) == len(expected)
+        titles = _titles(expected)
+        assert _index(document, titles) == _index(MarkdownDocument(expected, patterns), titles)
+
+    assert document.text == expected
+
+
+def test_splice_reports_whether_the_text_changed():
+    """A splice writing back the same text is not an edit."""
+    document = MarkdownDocument("abc\n", PatternCache())
+
+    assert document.splice(1, 2, "b") is False
+    assert document.revision == 0
+    assert document.splice(1, 2, "B") is True
+    assert document.revision == 1
+    assert document.text == "aBc\n"
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_lookups_agree_with_the_joined_text(seed):
+    """slice() and the newline searches see the text the pieces spell out."""
+    rng = random.Random(seed)
+    document = MarkdownDocument(BASE, PatternCache())
+    for _ in range(15):
+        document.splice_many(_random_edits(rng, len(document)))
+    text = MarkdownDocument.join(document.snapshot())
+
+    for _ in range(50):
+        start = rng.randint(0, len(text))
+        end = rng.randint(start, len(text))
+        assert document.slice(start, end) == text[start:end]
+        assert document.find_newline(start) == text.find("\n", start)
+        assert document.rfind_newline(end) == text.rfind("\n", 0, end)
+
+
+def test_snapshot_keeps_its_text_while_editing_goes_on():
+    """A snapshot joins to the text at the time it was taken."""
+    document = MarkdownDocument("start\n", PatternCache())
+    document.splice(len(document), len(document), "one\n")
+    snapshot = document.snapshot()
+
+    document.splice(0, 5, "changed")
+    assert document.text == "changed\none\n"
+    document.splice(len(document), len(document), "two\n")
+
+    assert MarkdownDocument.join(snapshot) == "start\none\n"
+    assert document.text == "changed\none\ntwo\n"
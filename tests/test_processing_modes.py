@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# file: tests/test_processing_modes.py
+# version: 1.0.0
+# guid: 826982c0-b7f7-46f3-accc-347afa7c2d02
+
+"""Every processing mode must leave the same documents and archive as the serial path.
+
+Covers batched (--batch), threaded (--jobs), atomic, pipelined and
+memory-mapped processing against plain one-update-at-a-time runs.
+"""
+
+import random
+import shutil
+from pathlib import Path
+
+import pytest
+from conftest import archived_names
+
+from doc_update_manager import DocumentationUpdateManager
+
+MODES = [
+    "append",
+    "append",
+    "task-add",
+    "changelog-entry",
+    "replace-section",
+    "prepend",
+    "insert-after",
+    "insert-before",
+    "task-complete",
+    "task-complete",
+    "update-badge",
+    "replace",
+]
+
+PROCESSING = {
+    "batch": {"batch": True},
+    "jobs": {"batch": True, "jobs": 3},
+    "atomic": {"atomic": True},
+    "pipeline": {"pipeline": True},
+    "pipeline-jobs": {"pipeline": True, "jobs": 3},
+    "mmap": {"mmap_threshold_bytes": 1},
+    "mmap-batch": {"batch": True, "mmap_threshold_bytes": 1},
+}
+
+
+def _build(work: Path, seed: int):
+    """Write three targets and a random queue of updates for them."""
+    rng = random.Random(seed)
+    shutil.rmtree(work, ignore_errors=True)
+    work.mkdir(parents=True)
+    (work / "A.md").write_text(
+        "# A\n\n## [Unreleased]\n\n- x\n\n## S\n\nbody anchor\n\n- [ ] t1\n- [ ] t2\n",
+        encoding="utf-8",
+    )
+    (work / "B.md").write_bytes("# B café\n\n## S\n\nanchor\n\n- [ ] t1\n".encode("latin-1"))
+    # The same targets spelled differently must still form one chain
+    spellings = {
+        "A.md": [str(work / "A.md"), f"{work}/./A.md"],
+        "B.md": [str(work / "B.md"), f"{work}/sub/../B.md"],
+        "C.md": [str(work / "C.md")],
+    }
+    updates = []
+    for number in range(rng.randint(1, 30)):
+        mode = rng.choice(MODES)
+        update = {
+            "file": rng.choice(spellings[rng.choice(list(spellings))]),
+            "mode": mode,
+            "content": f"c{number} é",
+        }
+        if mode == "replace-section":
+            update["options"] = {"section": "S"}
+        elif mode == "insert-after":
+            update["options"] = {"after": "anchor"}
+        elif mode == "insert-before":
+            update["options"] = {"before": "anchor"}
+        elif mode == "task-complete":
+            update["options"] = {"task_id": rng.choice(["t1", "t2", "missing"])}
+        elif mode == "update-badge":
+            update["options"] = {"badge_name": "build"}
+        elif mode == "task-add":
+            update["content"] = f"- [ ] n{number}"
+        updates.append(update)
+    return updates
+
+
+def _run(work: Path, updates, queue_updates, **options):
+    """Process the queue and return the targets' bytes and the archive layout."""
+    queue_updates(work / "updates", updates)
+    manager = DocumentationUpdateManager(updates_dir=str(work / "updates"), **options)
+    try:
+        manager.process_all_updates()
+    except Exception:
+        # Stopping on errors raises once the run has stopped
+        pass
+    # The serial path creates a missing target before applying an update to
+    # it, even one that then fails; the other paths only create it on write
+    documents = {
+        name: (work / name).read_bytes() if (work / name).exists() else b""
+        for name in ("A.md", "B.md", "C.md")
+    }
+    return documents, archived_names(work / "updates")
+
+
+@pytest.mark.parametrize("processing", sorted(PROCESSING))
+@pytest.mark.parametrize("seed", range(12))
+def test_mode_matches_serial_processing(tmp_path, queue_updates, processing, seed):
+    """Documents and archive routing match serial processing, failures included."""
+    updates = _build(tmp_path / "serial", seed)
+    expected = _run(tmp_path / "serial", updates, queue_updates)
+
+    updates = _build(tmp_path / processing, seed)
+    got = _run(tmp_path / processing, updates, queue_updates, **PROCESSING[processing])
+
+    assert got == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_pipeline_stopping_on_errors_commits_everything_before_the_failure(
+    tmp_path, queue_updates, seed
+):
+    """A failed update stops the pipeline, but earlier updates still reach disk."""
+    updates = _build(tmp_path / "serial", seed)
+    expected = _run(tmp_path / "serial", updates, queue_updates, continue_on_error=False)
+
+    for jobs in (1, 3):
+        work = tmp_path / f"pipeline-{jobs}"
+        updates = _build(work, seed)
+        got = _run(
+            work, updates, queue_updates, continue_on_error=False, pipeline=True, jobs=jobs
+        )
+        assert got == expected
+
+
+def test_replace_does_not_hide_a_failing_task_complete(tmp_path, queue_updates):
+    """An unknown task id still fails when a later replace overwrites the target."""
+    target = tmp_path / "T.md"
+    target.write_text("- [ ] t1\n", encoding="utf-8")
+    updates = [
+        {"file": str(target), "mode": "append", "content": "one"},
+        {
+            "file": str(target),
+            "mode": "task-complete",
+            "content": "",
+            "options": {"task_id": "nope"},
+        },
+        {"file": str(target), "mode": "append", "content": "two"},
+        {"file": str(target), "mode": "replace", "content": "fresh"},
+    ]
+    queue_updates(tmp_path / "updates", updates)
+
+    manager = DocumentationUpdateManager(updates_dir=str(tmp_path / "updates"), batch=True)
+    stats = manager.process_all_updates()
+
+    assert target.read_text(encoding="utf-8") == "fresh"
+    assert stats["files_failed"] == 1
+    assert stats["skipped_superseded"] == 1
+    assert archived_names(tmp_path / "updates")["failed"] == ["0002.json"]
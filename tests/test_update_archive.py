@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# file: tests/test_update_archive.py
+# version: 1.0.0
+# guid: c6eb0a80-24b8-4bcf-87b3-f3dc3bb7b141
+
+"""Tests for the date-sharded update archive, its compaction and retention."""
+
+import tarfile
+from datetime import date, datetime
+
+from doc_update_manager import DocumentationUpdateManager, UpdateArchive
+
+
+def _archive_file(archive: UpdateArchive, category_dir, name: str, when: datetime):
+    path = archive.path_for(category_dir, name, when)
+    path.write_text(name, encoding="utf-8")
+    return path
+
+
+def test_path_for_shards_by_day_and_never_reuses_a_name(tmp_path):
+    """Same-second archives of one name get distinct paths in the day's shard."""
+    archive = UpdateArchive(tmp_path)
+    when = datetime(2024, 3, 5, 14, 7, 9)
+
+    first = archive.path_for(tmp_path / "processed", "0001.json", when)
+    second = archive.path_for(tmp_path / "processed", "0001.json", when)
+
+    assert first == tmp_path / "processed" / "2024" / "03" / "05" / "140709_0001.json"
+    assert second == tmp_path / "processed" / "2024" / "03" / "05" / "140709_1_0001.json"
+
+
+def test_flat_files_move_into_their_day_shards(tmp_path):
+    """Files archived in the old flat layout are moved into date shards."""
+    category_dir = tmp_path / "processed"
+    category_dir.mkdir()
+    (category_dir / "20240305_140709_0001.json").write_text("{}", encoding="utf-8")
+    (category_dir / "notes.txt").write_text("kept", encoding="utf-8")
+
+    moved = UpdateArchive(tmp_path).shard_flat_files(category_dir)
+
+    assert moved == 1
+    assert (category_dir / "2024" / "03" / "05" / "140709_0001.json").exists()
+    assert (category_dir / "notes.txt").exists()
+
+
+def test_compact_packs_old_day_shards_into_segments(tmp_path):
+    """Day shards before the cutoff become one tar.gz each; newer ones stay."""
+    archive = UpdateArchive(tmp_path)
+    category_dir = tmp_path / "processed"
+    _archive_file(archive, category_dir, "a.json", datetime(2024, 3, 4, 9, 0, 0))
+    _archive_file(archive, category_dir, "b.json", datetime(2024, 3, 4, 10, 0, 0))
+    _archive_file(archive, category_dir, "c.json", datetime(2024, 3, 6, 9, 0, 0))
+
+    compacted = archive.compact(category_dir, date(2024, 3, 5))
+
+    assert compacted == 1
+    segment = category_dir / "2024" / "03" / "2024-03-04.tar.gz"
+    with tarfile.open(segment) as tar:
+        assert sorted(tar.getnames()) == ["090000_a.json", "100000_b.json"]
+    assert not (category_dir / "2024" / "03" / "04").exists()
+    assert (category_dir / "2024" / "03" / "06" / "090000_c.json").exists()
+
+    # A late file for a compacted day gets a segment of its own
+    _archive_file(archive, category_dir, "d.json", datetime(2024, 3, 4, 11, 0, 0))
+    assert archive.compact(category_dir, date(2024, 3, 5)) == 1
+    assert (category_dir / "2024" / "03" / "2024-03-04.1.tar.gz").exists()
+
+
+def test_prune_drops_old_shards_segments_and_empty_directories(tmp_path):
+    """Shards and segments before the cutoff are deleted with emptied parents."""
+    archive = UpdateArchive(tmp_path)
+    category_dir = tmp_path / "processed"
+    _archive_file(archive, category_dir, "old.json", datetime(2023, 12, 30, 9, 0, 0))
+    _archive_file(archive, category_dir, "older.json", datetime(2023, 11, 2, 9, 0, 0))
+    archive.compact(category_dir, date(2023, 12, 1))
+    _archive_file(archive, category_dir, "new.json", datetime(2024, 1, 2, 9, 0, 0))
+
+    pruned = archive.prune(category_dir, date(2024, 1, 1))
+
+    assert pruned == 2
+    assert not (category_dir / "2023").exists()
+    assert (category_dir / "2024" / "01" / "02" / "090000_new.json").exists()
+
+
+def test_processed_updates_are_archived_in_todays_shard(tmp_path, queue_updates):
+    """A processed update lands in processed/YYYY/MM/DD with its time prefix."""
+    target = tmp_path / "T.md"
+    queue_updates(
+        tmp_path / "updates", [{"file": str(target), "mode": "append", "content": "one"}]
+    )
+    manager = DocumentationUpdateManager(updates_dir=str(tmp_path / "updates"))
+
+    manager.process_all_updates()
+
+    (archived,) = (tmp_path / "updates" / "processed").rglob("*.json")
+    shard = archived.parent.relative_to(tmp_path / "updates" / "processed")
+    assert len(shard.parts) == 3
+    assert archived.name.endswith("_0001.json")
+    assert not list((tmp_path / "updates" / "errors").glob("*.jsonl"))
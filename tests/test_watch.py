@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# file: tests/test_watch.py
+# version: 1.0.0
+# guid: 61fbcb83-5e4a-4585-9e68-e7af31b89ea9
+
+"""Tests for --watch: failures are isolated and reruns never reapply updates."""
+
+import json
+import sys
+
+import pytest
+from conftest import archived_names
+
+import doc_update_manager
+from doc_update_manager import DocumentationUpdateManager, UpdateWatcher
+
+
+def _scripted_wait(monkeypatch, events):
+    """Replace UpdateWatcher.wait with callables run in turn, then stop watching."""
+    remaining = list(events)
+
+    def wait(self, timeout=None):
+        if not remaining:
+            raise KeyboardInterrupt
+        return remaining.pop(0)()
+
+    monkeypatch.setattr(UpdateWatcher, "wait", wait)
+
+
+def test_failing_update_is_archived_and_watching_continues(tmp_path, queue_updates, monkeypatch):
+    """A failure in any run goes to failed/ instead of ending the watcher."""
+    target = tmp_path / "T.md"
+    target.write_text("- [ ] t1\n", encoding="utf-8")
+    updates_dir = tmp_path / "updates"
+    bad = {"file": str(target), "mode": "task-complete", "content": "", "options": {"task_id": "x"}}
+    queue_updates(updates_dir, [bad])
+
+    def arrive():
+        update = {"file": str(target), "mode": "append", "content": "later"}
+        (updates_dir / "0002.json").write_text(json.dumps(update), encoding="utf-8")
+        return True
+
+    # A burst arrives, goes quiet, and the watcher is interrupted afterwards
+    _scripted_wait(monkeypatch, [arrive, lambda: False])
+    manager = DocumentationUpdateManager(updates_dir=str(updates_dir), continue_on_error=False)
+
+    with pytest.raises(KeyboardInterrupt):
+        manager.watch(debounce=0.01, poll_interval=0.01)
+
+    assert target.read_text(encoding="utf-8") == "- [ ] t1\n\nlater"
+    archive = archived_names(updates_dir)
+    assert archive["failed"] == ["0001.json"]
+    assert archive["processed"] == ["0002.json"]
+    assert archive["queued"] == []
+
+
+def test_journal_skips_updates_kept_by_an_earlier_run(tmp_path, queue_updates, monkeypatch):
+    """With --cleanup false, the journal skips updates applied by an earlier run."""
+    target = tmp_path / "T.md"
+    queue_updates(
+        tmp_path / "updates", [{"file": str(target), "mode": "append", "content": "once"}]
+    )
+    _scripted_wait(monkeypatch, [lambda: True, lambda: False])
+    manager = DocumentationUpdateManager(
+        updates_dir=str(tmp_path / "updates"), cleanup=False, journal=""
+    )
+
+    with pytest.raises(KeyboardInterrupt):
+        manager.watch(debounce=0.01, poll_interval=0.01)
+
+    assert target.read_text(encoding="utf-8") == "once"
+    assert manager.stats["skipped_journaled"] == 1
+
+
+def test_watch_without_cleanup_requires_a_journal(tmp_path, monkeypatch):
+    """Kept updates would be reapplied on every run unless a journal skips them."""
+
+    def watch(self, **kwargs):
+        raise AssertionError("watch started without a journal")
+
+    monkeypatch.setattr(DocumentationUpdateManager, "watch", watch)
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["doc_update_manager.py", "--updates-dir", str(tmp_path), "--watch", "--cleanup", "false"],
+    )
+
+    with pytest.raises(SystemExit) as excinfo:
+        doc_update_manager.main()
+
+    assert excinfo.value.code == 2